@@ -0,0 +1,29 @@
+from django.contrib import admin
+
+from apps.common import routers
+from apps.common.models import QueuedEmail
+
+
+class ReplicaChangeListMixin:
+    """
+    Read changelist pages from a read replica, see `apps.common.routers`.
+    Only GET requests, changelist actions (POST) work on the primary.
+    """
+
+    def changelist_view(self, request, extra_context=None):
+        if request.method == "GET":
+            request.changelist_replica = routers.replica_for(request)
+        return super().changelist_view(request, extra_context)
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if alias := getattr(request, "changelist_replica", None):
+            queryset = queryset.using(alias)
+        return queryset
+
+
+@admin.register(QueuedEmail)
+class QueuedEmailAdmin(admin.ModelAdmin):
+    list_display = ["id", "status", "attempts", "next_attempt_at", "created_at"]
+    list_filter = ["status"]
+    readonly_fields = ["payload", "attempts", "last_error", "created_at", "updated_at"]
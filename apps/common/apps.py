@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class CommonConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "common"
+    name = "apps.common"
+
+    def ready(self):
+        from apps.common import timing
+
+        connection_created.connect(timing.install_query_timer)
@@ -0,0 +1,181 @@
+import copy
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import authentication, tokens
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from apps.common.cache import LRUCache
+
+# User attributes copied into tokens at issue time
+USER_CLAIMS = ("email", "name", "is_staff", "is_superuser", "is_active", "deleted")
+
+user_cache = LRUCache(settings.JWT_USER_CACHE_SIZE, settings.JWT_USER_CACHE_TTL)
+
+
+class RefreshToken(tokens.RefreshToken):
+    """
+    Refresh token carrying `USER_CLAIMS`. Access tokens derived from it,
+    including refreshed ones, copy the claims, so they reflect the user as
+    of login until the refresh token expires.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+class ClaimsUser(TokenUser):
+    """request.user built from the signed claims of an access token"""
+
+    @cached_property
+    def email(self) -> str:
+        return self.token.get("email", "")
+
+    @cached_property
+    def name(self) -> str:
+        return self.token.get("name", "")
+
+    @cached_property
+    def is_active(self) -> bool:
+        return self.token.get("is_active", True)
+
+    @cached_property
+    def deleted(self) -> bool:
+        return self.token.get("deleted", False)
+
+
+class JWTAuthentication(authentication.JWTAuthentication):
+    """
+    JWTAuthentication resolving request.user according to
+    `settings.JWT_USER_RESOLUTION`:
+
+    - `db`: load the user row on every request (simplejwt's behaviour).
+    - `cache`: keep recently seen users in a per-process LRU cache,
+      invalidated when a user is saved or deleted.
+    - `claims`: build a `ClaimsUser` from the token, no query at all.
+      Tokens issued without the claims fall back to `db`. Users deactivated
+      or soft deleted after login keep access until their tokens expire, but
+      `get_model_user` refuses them wherever the row is needed.
+    """
+
+    def get_user(self, validated_token):
+        mode = settings.JWT_USER_RESOLUTION
+
+        if mode == "claims" and "email" in validated_token:
+            return self.get_claims_user(validated_token)
+
+        if mode != "cache":
+            return super().get_user(validated_token)
+
+        key = str(validated_token.get(api_settings.USER_ID_CLAIM))
+        if (user := user_cache.get(key)) is None:
+            user = super().get_user(validated_token)
+            user_cache.set(key, user)
+        else:
+            self.check_user(user, validated_token)
+
+        # Each request gets its own instance, the cached one is never mutated
+        return copy.copy(user)
+
+    async def aauthenticate(self, request):
+        """`authenticate` for async views, loading the user with the async ORM"""
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        mode = settings.JWT_USER_RESOLUTION
+
+        if mode == "claims" and "email" in validated_token:
+            return self.get_claims_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        key = str(user_id)
+        if mode == "cache" and (user := user_cache.get(key)) is not None:
+            self.check_user(user, validated_token)
+            return copy.copy(user)
+
+        try:
+            user = await self.user_model.objects.aget(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        self.check_user(user, validated_token)
+        if mode == "cache":
+            user_cache.set(key, user)
+            return copy.copy(user)
+        return user
+
+    def get_claims_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = ClaimsUser(validated_token)
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if user.deleted:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        return user
+
+    def check_user(self, user, validated_token):
+        """Checks simplejwt runs after loading a user"""
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+
+
+def user_authentication_rule(user) -> bool:
+    """SIMPLE_JWT USER_AUTHENTICATION_RULE, refusing soft deleted users too"""
+    return user is not None and user.is_active and not getattr(user, "deleted", False)
+
+
+def get_model_user(user):
+    """
+    Return the User row behind request.user, loading it for a ClaimsUser.
+    Claims outlive soft deletion, so a missing live row fails authentication.
+    """
+    if isinstance(user, TokenUser):
+        user_model = get_user_model()
+        try:
+            return user_model.objects.get(pk=user.pk)
+        except user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+    return user
+
+
+async def aget_model_user(user):
+    if isinstance(user, TokenUser):
+        user_model = get_user_model()
+        try:
+            return await user_model.objects.aget(pk=user.pk)
+        except user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+    return user
@@ -0,0 +1,109 @@
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache as default_cache
+
+# Seconds a recompute may hold the lock of get_or_compute, and how often
+# callers waiting for it check for the value
+LOCK_TIMEOUT = 5
+LOCK_POLL_INTERVAL = 0.05
+
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU cache with a time to live per entry.
+
+    Entries live in the worker's memory, so invalidation only reaches the
+    current process; `ttl` bounds how stale other workers can get.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+def get_or_compute(key, compute, fresh_for: float, stale_for: float = 0, cache=None):
+    """
+    Cached `compute()` with stale-while-revalidate and single-flight.
+
+    Values are fresh for `fresh_for` seconds and may then be served stale for
+    `stale_for` more while one caller, holding a lock taken with
+    `cache.add`, recomputes them. On a cold key the lock holder computes and
+    concurrent callers wait for its result, up to `LOCK_TIMEOUT`, instead of
+    all computing at once.
+    """
+    cache = cache or default_cache
+    lock_key = f"{key}:lock"
+
+    cached = cache.get(key)
+    if cached is not None:
+        value, fresh_until = cached
+        if fresh_until > time.time() or not cache.add(lock_key, 1, LOCK_TIMEOUT):
+            return value
+    elif not cache.add(lock_key, 1, LOCK_TIMEOUT):
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_INTERVAL)
+            if (cached := cache.get(key)) is not None:
+                return cached[0]
+        # lock holder died, compute without it
+
+    try:
+        value = compute()
+        cache.set(key, (value, time.time() + fresh_for), fresh_for + stale_for)
+    finally:
+        cache.delete(lock_key)
+    return value
+
+
+@functools.cache
+def serializer_version(serializer_class) -> str:
+    fields = ",".join(serializer_class().fields)
+    version = getattr(serializer_class, "cache_version", 1)
+    return hashlib.md5(f"{version}:{fields}".encode()).hexdigest()[:8]
+
+
+def serializer_cache_key(serializer_class, pk) -> str:
+    """
+    Cache key for `serializer_class`'s output for object `pk`. It changes with
+    the serializer's fields or its `cache_version`, so deploys changing the
+    output never read entries written by the previous version.
+    """
+    return f"{serializer_class.__name__}:{serializer_version(serializer_class)}:{pk}"
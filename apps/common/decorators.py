@@ -0,0 +1,14 @@
+def atomic_request(view):
+    """
+    Run `view` in a transaction whatever the request method, see
+    `apps.common.middleware.SelectiveAtomicRequestsMiddleware`.
+    Works on function views, view classes and viewset action methods.
+    """
+    view.atomic_request = True
+    return view
+
+
+def autocommit_request(view):
+    """Run `view` in autocommit mode, even for unsafe methods"""
+    view.atomic_request = False
+    return view
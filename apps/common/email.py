@@ -1,11 +1,22 @@
+from itertools import islice
+
 from django.conf import settings
-from django.core.mail import EmailMessage
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import QuerySet
+
+from apps.common.email_dispatch import adispatch, dispatch
+
+# SendGrid accepts up to 1000 personalizations per request
+MAX_RECIPIENTS_PER_MESSAGE = 1000
+# Anymail recipient statuses meaning the message will not be delivered
+FAILED_STATUSES = {"failed", "invalid", "rejected"}
 
 
 def send_email(to_email, subject, message, fail_silently=True):
     """
     Helper to send emails system wide.
     Special consideration made for sendgrid's dynamic templating.
+    Delivery follows `settings.EMAIL_DISPATCH_MODE`, see apps.common.email_dispatch.
 
     https://docs.sendgrid.com/ui/sending-email/how-to-send-an-email-with-dynamic-transactional-templates
     """
@@ -17,7 +28,20 @@ def send_email(to_email, subject, message, fail_silently=True):
         reply_to=[settings.DEFAULT_FROM_EMAIL],
     )
 
-    return msg.send(fail_silently=fail_silently)
+    return dispatch(msg, fail_silently=fail_silently)
+
+
+async def asend_email(to_email, subject, message, fail_silently=True):
+    """`send_email` for async views"""
+    msg = EmailMessage(
+        subject,
+        message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[to_email],
+        reply_to=[settings.DEFAULT_FROM_EMAIL],
+    )
+
+    return await adispatch(msg, fail_silently=fail_silently)
 
 
 def send_email_template(
@@ -26,6 +50,7 @@ def send_email_template(
     """
     Helper to send emails system wide.
     Special consideration made for sendgrid's dynamic templating.
+    Delivery follows `settings.EMAIL_DISPATCH_MODE`, see apps.common.email_dispatch.
 
     https://docs.sendgrid.com/ui/sending-email/how-to-send-an-email-with-dynamic-transactional-templates
     """
@@ -40,4 +65,64 @@ def send_email_template(
         msg.dynamic_template_data = dynamic_template_data
         msg.merge_global_data = dynamic_template_data
 
-    return msg.send(fail_silently=fail_silently)
+    return dispatch(msg, fail_silently=fail_silently)
+
+
+def send_email_template_bulk(
+    users,
+    template_id: str,
+    get_template_data=None,
+    global_template_data: dict = None,
+    batch_size: int = MAX_RECIPIENTS_PER_MESSAGE,
+):
+    """
+    Send a dynamic template to many users with one provider call per batch.
+
+    Each batch is a single message whose recipients get their own
+    personalization from `get_template_data(user)` (Anymail's merge_data),
+    on top of `global_template_data`. Querysets are streamed with
+    `.iterator()`, and all batches share one backend connection.
+
+    Sends right away regardless of `settings.EMAIL_DISPATCH_MODE`, so call it
+    from a command or worker rather than a request.
+
+    Returns the number of accepted recipients and a dict of failed
+    recipients' emails to the reason reported by the provider.
+    """
+    batch_size = min(batch_size, MAX_RECIPIENTS_PER_MESSAGE)
+    if isinstance(users, QuerySet):
+        users = users.iterator(chunk_size=batch_size)
+    users = iter(users)
+
+    sent, failed = 0, {}
+    with get_connection() as connection:
+        while batch := list(islice(users, batch_size)):
+            merge_data = {
+                user.email: get_template_data(user) if get_template_data else {}
+                for user in batch
+            }
+            msg = EmailMessage(
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                to=list(merge_data),
+                reply_to=[settings.DEFAULT_FROM_EMAIL],
+                connection=connection,
+            )
+            msg.template_id = template_id
+            msg.merge_data = merge_data
+            msg.merge_global_data = global_template_data or {}
+
+            try:
+                msg.send(fail_silently=False)
+            except Exception as e:
+                failed.update((email, str(e)) for email in merge_data)
+                continue
+
+            statuses = getattr(msg, "anymail_status", None)
+            for email in merge_data:
+                recipient = statuses.recipients.get(email) if statuses else None
+                if recipient is not None and recipient.status in FAILED_STATUSES:
+                    failed[email] = recipient.status
+                else:
+                    sent += 1
+
+    return sent, failed
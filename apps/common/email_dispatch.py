@@ -0,0 +1,239 @@
+"""
+Delivery of outgoing emails off the request thread.
+
+`settings.EMAIL_DISPATCH_MODE` selects how `dispatch` hands a message over:
+
+- `sync`: send it right away, in the calling thread.
+- `thread`: once the transaction commits, pass it to an in-process pool of
+  worker threads. Suited to local development; pending messages live in
+  memory and are sent before the process exits.
+- `queue`: write it to the `QueuedEmail` outbox in the current transaction.
+  The `send_queued_emails` command delivers it, so messages survive worker
+  restarts.
+
+Workers send each batch over one backend connection and retry failed
+messages with exponential backoff.
+"""
+import atexit
+import logging
+import queue
+import threading
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from apps.common.models import QueuedEmail
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_FIELDS = ("subject", "body", "from_email", "to", "cc", "bcc", "reply_to")
+# Anymail/SendGrid attributes set on messages by apps.common.email
+ESP_FIELDS = ("template_id", "dynamic_template_data", "merge_global_data", "merge_data")
+
+
+def to_payload(message: EmailMessage) -> dict:
+    if message.attachments or getattr(message, "alternatives", None):
+        raise ValueError("Queued emails do not support attachments or alternatives")
+
+    payload = {field: getattr(message, field) for field in MESSAGE_FIELDS}
+    payload["headers"] = message.extra_headers
+    for field in ESP_FIELDS:
+        if hasattr(message, field):
+            payload[field] = getattr(message, field)
+    return payload
+
+
+def from_payload(payload: dict) -> EmailMessage:
+    message = EmailMessage(
+        headers=payload.get("headers"),
+        **{field: payload[field] for field in MESSAGE_FIELDS},
+    )
+    for field in ESP_FIELDS:
+        if field in payload:
+            setattr(message, field, payload[field])
+    return message
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff before the next attempt of a message that failed `attempts` times"""
+    return timedelta(seconds=settings.EMAIL_DISPATCH_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def deliver(messages) -> list:
+    """
+    Send `messages` over a single backend connection.
+    Returns `(message, error)` pairs for the messages that failed.
+    """
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        return [(message, e) for message in messages]
+
+    failed = []
+    try:
+        for message in messages:
+            message.connection = connection
+            try:
+                message.send(fail_silently=False)
+            except Exception as e:
+                failed.append((message, e))
+    finally:
+        connection.close()
+
+    return failed
+
+
+class EmailWorkerPool:
+    """
+    Worker threads sending queued messages in batches of up to `batch_size`.
+    Started on first use; whatever is still queued at exit is sent by the
+    exiting thread.
+    """
+
+    def __init__(self, workers: int = 2, batch_size: int = 50, max_attempts: int = 5):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self._queue = queue.SimpleQueue()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def submit(self, message: EmailMessage, attempts: int = 0):
+        self.start()
+        self._queue.put((message, attempts))
+
+    def start(self):
+        if self._threads:
+            return
+
+        with self._lock:
+            if not self._threads:
+                for i in range(self.workers):
+                    thread = threading.Thread(
+                        target=self._run, name=f"email-worker-{i}", daemon=True
+                    )
+                    thread.start()
+                    self._threads.append(thread)
+                atexit.register(self.drain)
+
+    def drain(self):
+        """Send everything queued, in the calling thread"""
+        while batch := self._next_batch(block=False):
+            self._send(batch, retry=False)
+
+    def _run(self):
+        while True:
+            self._send(self._next_batch(block=True))
+
+    def _next_batch(self, block: bool) -> list:
+        batch = []
+        if block:
+            batch.append(self._queue.get())
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _send(self, batch, retry=True):
+        attempts = {id(message): count for message, count in batch}
+        for message, error in deliver([message for message, _ in batch]):
+            count = attempts[id(message)] + 1
+            if retry and count < self.max_attempts:
+                timer = threading.Timer(
+                    retry_delay(count).total_seconds(), self.submit, (message, count)
+                )
+                timer.daemon = True
+                timer.start()
+            else:
+                logger.error("Giving up on email to %s: %s", message.to, error)
+
+
+pool = EmailWorkerPool(
+    workers=settings.EMAIL_DISPATCH_WORKERS,
+    batch_size=settings.EMAIL_DISPATCH_BATCH_SIZE,
+    max_attempts=settings.EMAIL_DISPATCH_MAX_ATTEMPTS,
+)
+
+
+def dispatch(message: EmailMessage, fail_silently=True) -> int:
+    """
+    Hand `message` over according to `settings.EMAIL_DISPATCH_MODE`.
+    Returns the number of messages sent or queued.
+    """
+    mode = settings.EMAIL_DISPATCH_MODE
+
+    if mode == "queue":
+        QueuedEmail.objects.create(payload=to_payload(message))
+    elif mode == "thread":
+        transaction.on_commit(lambda: pool.submit(message))
+    else:
+        return message.send(fail_silently=fail_silently)
+
+    return 1
+
+
+async def adispatch(message: EmailMessage, fail_silently=True) -> int:
+    """
+    `dispatch` for async views. They run in autocommit mode, so `thread`
+    hands the message to the workers right away.
+    """
+    mode = settings.EMAIL_DISPATCH_MODE
+
+    if mode == "queue":
+        await QueuedEmail.objects.acreate(payload=to_payload(message))
+    elif mode == "thread":
+        pool.submit(message)
+    else:
+        return await sync_to_async(message.send)(fail_silently=fail_silently)
+
+    return 1
+
+
+def send_queued(batch_size: int = None) -> tuple:
+    """
+    Deliver one batch of due `QueuedEmail` rows over a single connection.
+    Rows are locked with SKIP LOCKED so several workers can run side by side.
+    Returns the number of sent and failed messages.
+    """
+    batch_size = batch_size or settings.EMAIL_DISPATCH_BATCH_SIZE
+    now = timezone.now()
+
+    with transaction.atomic():
+        emails = list(
+            QueuedEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=QueuedEmail.Status.PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        if not emails:
+            return 0, 0
+
+        messages = [from_payload(email.payload) for email in emails]
+        errors = {id(message): error for message, error in deliver(messages)}
+
+        for email, message in zip(emails, messages):
+            email.attempts += 1
+            email.updated_at = now
+            error = errors.get(id(message))
+            if error is None:
+                email.status = QueuedEmail.Status.SENT
+                email.last_error = ""
+            elif email.attempts >= settings.EMAIL_DISPATCH_MAX_ATTEMPTS:
+                email.status = QueuedEmail.Status.FAILED
+                email.last_error = str(error)
+            else:
+                email.next_attempt_at = now + retry_delay(email.attempts)
+                email.last_error = str(error)
+
+        QueuedEmail.objects.bulk_update(
+            emails,
+            ["status", "attempts", "next_attempt_at", "last_error", "updated_at"],
+        )
+
+    return len(emails) - len(errors), len(errors)
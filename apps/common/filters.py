@@ -0,0 +1,75 @@
+import operator
+from functools import reduce
+
+from django.db import connections, models
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+
+
+class IndexedSearchFilter(SearchFilter):
+    """
+    `SearchFilter` whose lookups PostgreSQL can answer from indexes.
+
+    - Plain `search_fields` keep DRF's `icontains`, which PostgreSQL runs as
+      `UPPER(column) LIKE UPPER('%term%')`: a pg_trgm GIN index on
+      `UPPER(column)` serves it instead of a sequential scan.
+    - `@field` matches whole words and word prefixes against the stored
+      tsvector column the view maps it to in `search_vectors`
+      ({field: column}), backed by a GIN index. Without a column, or on
+      other databases, `@field` falls back to `icontains`.
+    """
+
+    search_config = "simple"
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+
+        if not search_fields or not search_terms:
+            return queryset
+
+        vectors = self.get_search_vectors(view, queryset)
+        base = queryset
+        conditions = (
+            reduce(
+                operator.or_,
+                (
+                    self.build_condition(str(search_field), term, queryset, vectors)
+                    for search_field in search_fields
+                ),
+            )
+            for term in search_terms
+        )
+        queryset = queryset.filter(reduce(operator.and_, conditions))
+
+        if self.must_call_distinct(queryset, search_fields):
+            queryset = queryset.filter(pk=models.OuterRef("pk"))
+            queryset = base.filter(models.Exists(queryset))
+        return queryset
+
+    def get_search_vectors(self, view, queryset):
+        if connections[queryset.db].vendor != "postgresql":
+            return {}
+        return getattr(view, "search_vectors", {})
+
+    def build_condition(self, search_field, term, queryset, vectors):
+        if search_field.startswith("@"):
+            search_field = search_field[1:]
+            if column := vectors.get(search_field):
+                return models.Q(self.match_vector(queryset, column, term))
+        return models.Q(**{self.construct_search(search_field, queryset): term})
+
+    def match_vector(self, queryset, column, term):
+        quote_name = connections[queryset.db].ops.quote_name
+        column = f"{quote_name(queryset.model._meta.db_table)}.{quote_name(column)}"
+        return RawSQL(
+            f"{column} @@ to_tsquery(%s, %s)",
+            [self.search_config, self.prefix_query(term)],
+            output_field=models.BooleanField(),
+        )
+
+    @staticmethod
+    def prefix_query(term):
+        """`term` as one quoted tsquery operand, its last word a prefix"""
+        term = term.replace("\\", "\\\\").replace("'", "''")
+        return f"'{term}':*"
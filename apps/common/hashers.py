@@ -0,0 +1,80 @@
+"""
+Password hashing off the request thread.
+
+Hashes run on a bounded pool of `settings.PASSWORD_HASHING_WORKERS` threads.
+PBKDF2 and the other hashlib based hashers release the GIL, so the pool
+caps how many hashes compete for the CPU at once, and async views can await
+them without blocking the event loop. With no workers hashes run inline.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    PBKDF2 with iterations from `settings.PASSWORD_HASHER_ITERATIONS`.
+    Passwords hashed with other iterations are rehashed on the next
+    successful check.
+    """
+
+    @property
+    def iterations(self) -> int:
+        return (
+            settings.PASSWORD_HASHER_ITERATIONS
+            or hashers.PBKDF2PasswordHasher.iterations
+        )
+
+
+@cache
+def get_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(
+        max_workers=settings.PASSWORD_HASHING_WORKERS,
+        thread_name_prefix="password-hasher",
+    )
+
+
+def _check(password, encoded) -> tuple:
+    """Check `password`, and hash it again if the hasher parameters changed"""
+    rehashed = None
+
+    def setter(raw_password):
+        nonlocal rehashed
+        rehashed = hashers.make_password(raw_password)
+
+    return hashers.check_password(password, encoded, setter), rehashed
+
+
+def _run(func, *args):
+    if not settings.PASSWORD_HASHING_WORKERS:
+        return func(*args)
+    return get_executor().submit(func, *args).result()
+
+
+async def _arun(func, *args):
+    if not settings.PASSWORD_HASHING_WORKERS:
+        return func(*args)
+    return await asyncio.wrap_future(get_executor().submit(func, *args))
+
+
+def make_password(password) -> str:
+    return _run(hashers.make_password, password)
+
+
+def check_password(password, encoded) -> tuple:
+    """
+    Returns whether `password` matches `encoded`, and the new hash to store
+    when the password was hashed with outdated parameters.
+    """
+    return _run(_check, password, encoded)
+
+
+async def amake_password(password) -> str:
+    return await _arun(hashers.make_password, password)
+
+
+async def acheck_password(password, encoded) -> tuple:
+    return await _arun(_check, password, encoded)
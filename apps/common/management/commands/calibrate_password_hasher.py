@@ -0,0 +1,92 @@
+import re
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.hashers import PBKDF2PasswordHasher
+
+# Iterations are rounded to this step, and never go below Django's default
+# unless --allow-weaker is given.
+STEP = 10000
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure PBKDF2 hashing time on this host and recommend "
+        "PASSWORD_HASHER_ITERATIONS for a latency target"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target-ms", type=float, default=250, help="Hash time to aim for"
+        )
+        parser.add_argument("--samples", type=int, default=5)
+        parser.add_argument(
+            "--allow-weaker",
+            action="store_true",
+            help="Allow fewer iterations than Django's default",
+        )
+        parser.add_argument(
+            "--write",
+            action="store_true",
+            help="Store the recommendation in the project's .env file",
+        )
+
+    def handle(self, *args, **options):
+        hasher = hashers.get_hasher()
+        if not isinstance(hasher, PBKDF2PasswordHasher):
+            raise CommandError(
+                f"The default hasher is {hasher.algorithm}, "
+                "only apps.common.hashers.PBKDF2PasswordHasher is calibrated"
+            )
+
+        current = hasher.iterations
+        ms = self.measure(hasher, current, options["samples"])
+        self.stdout.write(f"{current} iterations: {ms:.1f} ms per hash")
+
+        recommended = round(current * options["target_ms"] / ms / STEP) * STEP
+        minimum = hashers.PBKDF2PasswordHasher.iterations
+        if recommended < minimum and not options["allow_weaker"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{options['target_ms']} ms allows {recommended} iterations, "
+                    f"keeping Django's default of {minimum}"
+                )
+            )
+            recommended = minimum
+        recommended = max(recommended, STEP)
+
+        self.stdout.write(
+            f"Recommended: PASSWORD_HASHER_ITERATIONS={recommended} "
+            f"(~{ms * recommended / current:.0f} ms per hash)"
+        )
+
+        if options["write"]:
+            self.write_env(recommended)
+
+    def measure(self, hasher, iterations, samples) -> float:
+        """Median milliseconds to hash a password with `iterations`"""
+        salt = hasher.salt()
+        timings = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            hasher.encode("calibration-password", salt, iterations)
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
+
+    def write_env(self, iterations):
+        path = settings.BASE_DIR / ".env"
+        line = f"PASSWORD_HASHER_ITERATIONS={iterations}"
+        content = path.read_text() if path.exists() else ""
+
+        pattern = re.compile(r"^PASSWORD_HASHER_ITERATIONS=.*$", re.MULTILINE)
+        if pattern.search(content):
+            content = pattern.sub(line, content)
+        else:
+            content = f"{content.rstrip()}\n{line}\n".lstrip()
+
+        path.write_text(content)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {line} to {path}"))
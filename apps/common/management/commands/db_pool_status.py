@@ -0,0 +1,86 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+SERVER_STATS_SQL = """
+SELECT
+    current_setting('max_connections')::int,
+    count(*),
+    count(*) FILTER (WHERE state = 'active'),
+    count(*) FILTER (WHERE state = 'idle'),
+    count(*) FILTER (WHERE state IN ('idle in transaction', 'idle in transaction (aborted)')),
+    count(*) FILTER (WHERE wait_event_type = 'Lock')
+FROM pg_stat_activity
+WHERE backend_type = 'client backend'
+"""
+
+
+class Command(BaseCommand):
+    help = "Report connection pool settings and PostgreSQL connection saturation"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Worker processes sharing the database, to size the pools against max_connections",
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        if connection.vendor != "postgresql":
+            raise CommandError(
+                f"{connection.vendor} has no connection pool to report on"
+            )
+
+        pool_options = connection.settings_dict.get("OPTIONS", {}).get("pool")
+        if pool_options:
+            self.report_pool(connection, pool_options)
+        else:
+            self.stdout.write(
+                f"Pooling off, CONN_MAX_AGE={connection.settings_dict['CONN_MAX_AGE']}"
+            )
+
+        with connection.cursor() as cursor:
+            cursor.execute(SERVER_STATS_SQL)
+            (
+                max_connections,
+                total,
+                active,
+                idle,
+                idle_in_tx,
+                waiting,
+            ) = cursor.fetchone()
+
+        usage = total / max_connections
+        style = self.style.ERROR if usage >= 0.9 else self.style.SUCCESS
+        self.stdout.write(
+            style(f"Server: {total}/{max_connections} connections ({usage:.0%})")
+        )
+        self.stdout.write(
+            f"  active={active} idle={idle} idle_in_transaction={idle_in_tx} "
+            f"waiting_on_locks={waiting}"
+        )
+
+        if pool_options and options["workers"]:
+            needed = options["workers"] * pool_options.get("max_size", 0)
+            if needed > max_connections:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"{options['workers']} workers can open {needed} connections, "
+                        f"more than max_connections={max_connections}"
+                    )
+                )
+
+    def report_pool(self, connection, pool_options):
+        settings = " ".join(
+            f"{key}={value}" for key, value in pool_options.items() if key != "check"
+        )
+        self.stdout.write(f"Pool settings: {settings}")
+
+        # Only this process' pool is visible here, web workers each have their own
+        connection.ensure_connection()
+        stats = connection.pool.get_stats()
+        self.stdout.write(
+            f"Local pool: size={stats['pool_size']} available={stats['pool_available']} "
+            f"waiting={stats['requests_waiting']}"
+        )
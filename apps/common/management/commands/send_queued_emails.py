@@ -0,0 +1,39 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.common.email_dispatch import send_queued
+
+
+class Command(BaseCommand):
+    help = "Deliver emails waiting in the QueuedEmail outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.EMAIL_DISPATCH_BATCH_SIZE
+        )
+        parser.add_argument(
+            "--loop", action="store_true", help="Keep polling for new emails"
+        )
+        parser.add_argument(
+            "--interval", type=float, default=1, help="Seconds between polls"
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent = failed = 0
+            while True:
+                batch_sent, batch_failed = send_queued(options["batch_size"])
+                sent, failed = sent + batch_sent, failed + batch_failed
+                if batch_sent + batch_failed < options["batch_size"]:
+                    break
+
+            if sent or failed or not options["loop"]:
+                self.stdout.write(f"Sent {sent} emails, {failed} failed")
+            if not options["loop"]:
+                return
+
+            close_old_connections()
+            time.sleep(options["interval"])
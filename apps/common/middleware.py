@@ -0,0 +1,241 @@
+import logging
+import random
+import time
+from contextlib import ExitStack, nullcontext
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils.deprecation import MiddlewareMixin
+
+from apps.common import routers, timing
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+
+class SelectiveAtomicRequestsMiddleware(MiddlewareMixin):
+    """
+    ATOMIC_REQUESTS for unsafe methods only.
+
+    Views answering POST/PUT/PATCH/DELETE run in a transaction rolled back on
+    exceptions, and on exceptions handled by DRF like ATOMIC_REQUESTS does.
+    Safe methods run in autocommit mode, saving the BEGIN/COMMIT round trips
+    and the snapshot held for the whole request. Views opt in or out with
+    `apps.common.decorators.atomic_request` / `autocommit_request`.
+
+    Must be the last middleware, so no other `process_view` is skipped.
+    Async views are left alone, Django does not run them in transactions.
+    """
+
+    databases = (DEFAULT_DB_ALIAS,)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if iscoroutinefunction(view_func) or not self.is_atomic(request, view_func):
+            return None
+
+        with ExitStack() as stack:
+            for alias in self.databases:
+                stack.enter_context(transaction.atomic(using=alias))
+
+            response = view_func(request, *view_args, **view_kwargs)
+            # DRF flags responses built from exceptions it handled
+            if getattr(response, "exception", False):
+                for alias in self.databases:
+                    transaction.set_rollback(True, using=alias)
+
+        return response
+
+    def is_atomic(self, request, view_func) -> bool:
+        for target in self.get_targets(request, view_func):
+            atomic = getattr(target, "atomic_request", None)
+            if atomic is not None:
+                return atomic
+        return request.method not in SAFE_METHODS
+
+    @staticmethod
+    def get_targets(request, view_func):
+        """The viewset action method, view class and view function, in that order"""
+        view_class = getattr(view_func, "cls", None) or getattr(
+            view_func, "view_class", None
+        )
+        actions = getattr(view_func, "actions", None)
+        if view_class is not None and actions:
+            action = actions.get(request.method.lower())
+            if action is not None:
+                yield getattr(view_class, action, None)
+        if view_class is not None:
+            yield view_class
+        yield view_func
+
+
+class ReplicaPinMiddleware:
+    """
+    Tracks writes for `apps.common.routers` and keeps clients that wrote on
+    the primary for `DATABASE_REPLICA_PIN_SECONDS`, so they read their own
+    writes: through a cookie, and a cache key for authenticated users.
+    """
+
+    sync_capable = True
+    async_capable = True
+    cookie_name = "primary_pin"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        with routers.routing_state(pinned=self.cookie_name in request.COOKIES) as state:
+            response = self.get_response(request)
+        return self.process_response(request, response, state)
+
+    async def __acall__(self, request):
+        with routers.routing_state(pinned=self.cookie_name in request.COOKIES) as state:
+            response = await self.get_response(request)
+        return self.process_response(request, response, state)
+
+    def process_response(self, request, response, state):
+        if not state.wrote:
+            return response
+
+        response.set_cookie(
+            self.cookie_name,
+            "1",
+            max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+            httponly=True,
+            samesite="Lax",
+        )
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            routers.pin_user(user)
+        return response
+
+
+class ServerTimingMiddleware:
+    """
+    Times requests and reports where the time went.
+
+    Every request's wall time is measured, and requests slower than
+    `SERVER_TIMING_SLOW_MS` are logged. A `SERVER_TIMING_SAMPLE_RATE`
+    fraction of requests are also instrumented: database queries are counted
+    and timed on every alias, along with the phases views account through
+    `apps.common.timing.phase` (auth, serialize, render for views using
+    `ServerTimingMixin`). Sampled requests are logged with those fields and,
+    with `SERVER_TIMING_HEADER`, answered with a `Server-Timing` header.
+
+    Streaming responses run their queries, serialization and rendering while
+    the body is sent, after the view returned. Their content is wrapped so
+    instrumentation stays active through every chunk, which is accounted as
+    the `stream` phase, and they are logged once the body has been sent,
+    without a header: it is gone by then.
+
+    Must be the first middleware, so the total covers the others.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        start = time.perf_counter()
+        if not self.is_sampled(request):
+            response = self.get_response(request)
+            return self.process_response(request, response, None, start)
+
+        with timing.recording() as timings:
+            response = self.get_response(request)
+        return self.process_response(request, response, timings, start)
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        if not self.is_sampled(request):
+            response = await self.get_response(request)
+            return self.process_response(request, response, None, start)
+
+        with timing.recording() as timings:
+            response = await self.get_response(request)
+        return self.process_response(request, response, timings, start)
+
+    def is_sampled(self, request) -> bool:
+        rate = settings.SERVER_TIMING_SAMPLE_RATE
+        return rate >= 1 or (rate > 0 and random.random() < rate)
+
+    def process_response(self, request, response, timings, start):
+        if not response.streaming:
+            self.report(request, response, timings, start)
+            return response
+
+        def finish():
+            self.report(request, response, timings, start, header=False)
+
+        stream = self.astream if response.is_async else self.stream
+        response.streaming_content = stream(response.streaming_content, timings, finish)
+        return response
+
+    @staticmethod
+    def activate(timings):
+        return timing.recording(timings) if timings is not None else nullcontext()
+
+    def stream(self, content, timings, finish):
+        content = iter(content)
+        try:
+            while True:
+                with self.activate(timings), timing.phase("stream"):
+                    try:
+                        chunk = next(content)
+                    except StopIteration:
+                        return
+                yield chunk
+        finally:
+            finish()
+
+    async def astream(self, content, timings, finish):
+        content = aiter(content)
+        try:
+            while True:
+                with self.activate(timings), timing.phase("stream"):
+                    try:
+                        chunk = await anext(content)
+                    except StopAsyncIteration:
+                        return
+                yield chunk
+        finally:
+            finish()
+
+    def report(self, request, response, timings, start, header=True):
+        total = time.perf_counter() - start
+        slow = total * 1000 >= settings.SERVER_TIMING_SLOW_MS
+        if timings is None and not slow:
+            return
+
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(total * 1000, 1),
+        }
+        if timings is not None:
+            for name, duration, _ in timings.metrics(total)[:-1]:
+                fields[f"{name}_ms"] = round(duration, 1)
+            fields["queries"] = timings.queries
+            if header and settings.SERVER_TIMING_HEADER:
+                response["Server-Timing"] = timings.header(total)
+
+        logger.log(
+            logging.WARNING if slow else logging.INFO,
+            "request timing %s",
+            " ".join(f"{key}={value}" for key, value in fields.items()),
+            extra={"timing": fields},
+        )
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-16 23:37
+
+import apps.common.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='queuedemail',
+            name='id',
+            field=models.UUIDField(default=apps.common.ids.generate_id, editable=False, primary_key=True, serialize=False, unique=True),
+        ),
+    ]
@@ -1,17 +1,77 @@
-import uuid
-
-from django.db import models
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models, transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from apps.common.ids import generate_id
+from apps.common.signals import bulk_updated
+
+
+class BaseQuerySet(models.QuerySet):
+    """
+    Set-based counterparts of `BaseModel.activate()`/`deactivate()`.
+
+    Rows are updated `chunk_size` at a time, one UPDATE and one transaction
+    per chunk, so large cohorts neither hold locks for long nor build huge
+    statements. Rows already in the target state are skipped and keep their
+    `updated_at`, like the instance methods. `bulk_updated` is sent for every
+    chunk, as `update()` sends no `post_save`.
+    """
+
+    chunk_size = 1000
+
+    def activate(self, chunk_size=None) -> int:
+        return self.update_in_chunks(chunk_size, is_active=True)
+
+    def deactivate(self, chunk_size=None) -> int:
+        return self.update_in_chunks(chunk_size, is_active=False)
+
+    def soft_delete(self, chunk_size=None) -> int:
+        """Flag rows `deleted` and deactivate them, for models with a `deleted` field"""
+        try:
+            self.model._meta.get_field("deleted")
+        except FieldDoesNotExist:
+            raise TypeError(f"{self.model.__name__} has no deleted field") from None
+        return self.update_in_chunks(chunk_size, deleted=True, is_active=False)
+
+    def update_in_chunks(self, chunk_size=None, **values) -> int:
+        """Set `values` on the matching rows, returns the number of rows changed"""
+        chunk_size = chunk_size or self.chunk_size
+        queryset = self.exclude(**values).order_by("pk")
+        updated = 0
+        last_pk = None
+
+        while True:
+            chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            pks = list(chunk.values_list("pk", flat=True)[:chunk_size])
+            if not pks:
+                return updated
+
+            with transaction.atomic(using=self.db):
+                updated += (
+                    self.model._base_manager.using(self.db)
+                    .filter(pk__in=pks)
+                    .update(updated_at=timezone.now(), **values)
+                )
+                bulk_updated.send(
+                    sender=self.model, pks=pks, values=values, using=self.db
+                )
+            last_pk = pks[-1]
+
+
+BaseManager = models.Manager.from_queryset(BaseQuerySet)
+
 
 class BaseModel(models.Model):
     id = models.UUIDField(
-        default=uuid.uuid4, editable=False, unique=True, primary_key=True
+        default=generate_id, editable=False, unique=True, primary_key=True
     )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("created_at"))
     updated_at = models.DateTimeField(auto_now=True, verbose_name=_("updated at"))
     is_active = models.BooleanField(default=True)
 
+    objects = BaseManager()
+
     class Meta:
         abstract = True
 
@@ -30,3 +90,31 @@ class BaseModel(models.Model):
         if self.is_active:
             self.is_active = False
             self.save(update_fields=["is_active", "updated_at"] if self.pk else None)
+
+
+class QueuedEmail(BaseModel):
+    """
+    Outbox row for an email, written in the same transaction as the change
+    that triggered it and delivered by the `send_queued_emails` command.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        SENT = "sent", _("Sent")
+        FAILED = "failed", _("Failed")
+
+    payload = models.JSONField()
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ("created_at",)
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"], name="common_queuedemail_due_idx"
+            ),
+        ]
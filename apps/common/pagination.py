@@ -1,4 +1,16 @@
-from rest_framework.pagination import PageNumberPagination
+import hashlib
+import json
+from functools import cached_property, partial
+
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import Cursor, CursorPagination, PageNumberPagination
+from rest_framework.response import Response
 
 
 class DefaultPagination(PageNumberPagination):
@@ -11,3 +23,343 @@ class LargePagination(PageNumberPagination):
     page_size = 1000
     page_size_query_param = "page_size"
     max_page_size = 10000
+
+
+def estimate_count(queryset):
+    """
+    Return the planner's row estimate for the queryset's table, or None
+    when the database can't provide one cheaply.
+
+    PostgreSQL reads `pg_class.reltuples` (kept fresh by autovacuum/ANALYZE)
+    of the table, or of the partial index `estimate_relation` picks for a
+    manager's base filter. SQLite falls back to `MAX(rowid)`, an upper bound
+    that is exact until rows are deleted.
+    """
+    connection = connections[queryset.db]
+    table = connection.ops.quote_name(queryset.model._meta.db_table)
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            relation = estimate_relation(queryset) or queryset.model._meta.db_table
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [connection.ops.quote_name(relation)],
+            )
+        elif connection.vendor == "sqlite":
+            cursor.execute(f"SELECT MAX(_rowid_) FROM {table}")
+        else:
+            return None
+        row = cursor.fetchone()
+
+    # reltuples is -1 for tables that have never been analyzed
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def estimate_relation(queryset):
+    """
+    Relation holding one entry per row of `queryset`: its table when it is
+    unfiltered, or the partial index a manager names in `estimate_index`
+    when the queryset only carries that manager's base filter (live users
+    only, say). None for anything else.
+    """
+    query = queryset.query
+    if query.distinct or query.combinator or query.is_sliced:
+        return None
+    if not query.where:
+        return queryset.model._meta.db_table
+
+    for manager in queryset.model._meta.managers:
+        index = getattr(manager, "estimate_index", None)
+        if index and query.where == manager.get_queryset().query.where:
+            return index
+    return None
+
+
+def is_unfiltered(queryset) -> bool:
+    return estimate_relation(queryset) is not None
+
+
+class CountedPaginator(Paginator):
+    """Django paginator that uses a precomputed count"""
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        if count is not None:
+            self.count = count
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Django paginator for large tables, meant for admin changelists.
+
+    Unfiltered querysets report the planner's estimate once it reaches
+    `estimate_threshold`. Filtered ones are counted up to `count_limit` rows
+    past the start of `page_number`, the page being shown, so a broad search
+    stops counting instead of scanning everything while the pages after the
+    cap stay reachable. `count_capped` tells when the count stopped there.
+    """
+
+    estimate_threshold = 10000
+    count_limit = 10000
+
+    def __init__(self, *args, page_number=1, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.page_number = page_number
+        self.count_capped = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, "query"):
+            return len(queryset)
+
+        if is_unfiltered(queryset):
+            estimate = estimate_count(queryset)
+            if estimate is not None and estimate >= self.estimate_threshold:
+                return estimate
+
+        offset = max(self.page_number - 1, 0) * self.per_page
+        stop = offset + self.count_limit + 1
+        counted = queryset.order_by()[offset:stop].count()
+        if counted > self.count_limit:
+            self.count_capped = True
+            return offset + self.count_limit
+        return offset + counted
+
+
+class FastCountPagination(DefaultPagination):
+    """
+    DefaultPagination with cheaper counts. Both modes are opt-in:
+
+    - `estimate_count`: unfiltered querysets larger than
+      `estimate_threshold` report the planner's estimate.
+    - `count_cache_timeout`: exact counts are cached per query for that
+      many seconds.
+
+    The response carries `count_exact` so clients know which one they got.
+    """
+
+    estimate_count = False
+    estimate_threshold = 10000
+    count_cache_timeout = None
+    count_cache_prefix = "pagination:count"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.get_page_size(request):
+            return None
+
+        count, self.count_exact = self.get_count(queryset)
+        self.django_paginator_class = partial(CountedPaginator, count=count)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count(self, queryset):
+        """Return `(count, exact)` for the queryset"""
+        if self.estimate_count and is_unfiltered(queryset):
+            estimate = estimate_count(queryset)
+            if estimate is not None and estimate >= self.estimate_threshold:
+                return estimate, False
+
+        if not self.count_cache_timeout:
+            return queryset.count(), True
+
+        # The compiled query covers filters, search terms and any scoping
+        # done in get_queryset, so requests only share a count when they
+        # would run the same COUNT(*)
+        sql, params = queryset.query.sql_with_params()
+        digest = hashlib.md5(f"{sql}{params!r}".encode()).hexdigest()
+        key = f"{self.count_cache_prefix}:{queryset.db}:{digest}"
+
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, self.count_cache_timeout)
+        return count, True
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.page.paginator.count,
+                "count_exact": self.count_exact,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_exact"] = {
+            "type": "boolean",
+            "example": True,
+        }
+        return response_schema
+
+
+def is_indexed(model, field_name: str) -> bool:
+    """Check whether `field_name` leads an index on `model`"""
+    field = model._meta.get_field(field_name)
+    if field.primary_key or field.unique or field.db_index:
+        return True
+
+    for index in model._meta.indexes:
+        if index.fields and index.fields[0].lstrip("-") == field_name:
+            return True
+
+    return False
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset pagination on `(ordering field, id)`.
+
+    Pages are fetched with a `WHERE (field, id) > (value, id)` seek instead
+    of an OFFSET scan and no COUNT is issued, so every page costs the same
+    no matter how deep the client is. Only the first term of the requested
+    ordering is used and it must be backed by an index.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "created_at"
+    tiebreaker = "id"
+    invalid_ordering_message = "Ordering by `{field}` is not supported."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.model = queryset.model
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        if self.cursor is None:
+            reverse, current_position = False, None
+        else:
+            reverse, current_position = self.cursor.reverse, self.cursor.position
+
+        ordering = self._reverse(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+
+        if current_position is not None:
+            queryset = queryset.filter(self._seek(ordering, current_position))
+
+        # Fetch one extra row to know whether there is a following page
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        has_following = len(results) > self.page_size
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = current_position is not None
+
+        if self.page:
+            self.next_position = self._get_position(self.page[-1])
+            self.previous_position = self._get_position(self.page[0])
+        else:
+            # Empty page, step back to where the cursor pointed
+            self.next_position = self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        cursor = Cursor(offset=0, reverse=False, position=self.next_position)
+        return self.encode_cursor(cursor)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        cursor = Cursor(offset=0, reverse=True, position=self.previous_position)
+        return self.encode_cursor(cursor)
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Return `(field, tiebreaker)` taken from the ordering filter or the
+        pagination default. Raises a validation error for fields that cannot
+        be seeked efficiently.
+        """
+        ordering = super().get_ordering(request, queryset, view)[0]
+        model = queryset.model
+        field_name = ordering.lstrip("-")
+        if field_name == "pk":
+            field_name = model._meta.pk.name
+
+        try:
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            field = None
+
+        if field is None or field.null or not is_indexed(model, field_name):
+            raise ValidationError(
+                {"ordering": [self.invalid_ordering_message.format(field=field_name)]}
+            )
+
+        prefix = "-" if ordering.startswith("-") else ""
+        if field.primary_key or field.unique:
+            return (f"{prefix}{field_name}",)
+        return (f"{prefix}{field_name}", f"{prefix}{self.tiebreaker}")
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        if cursor is None or cursor.position is None:
+            return cursor
+
+        try:
+            values = json.loads(cursor.position)
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError("Cursor does not match the ordering")
+            position = tuple(
+                self.model._meta.get_field(order.lstrip("-")).to_python(value)
+                for order, value in zip(self.ordering, values)
+            )
+        except (TypeError, ValueError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(offset=0, reverse=cursor.reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        position = json.dumps([str(value) for value in cursor.position])
+        return super().encode_cursor(cursor._replace(position=position))
+
+    def _get_position(self, item):
+        return tuple(getattr(item, order.lstrip("-")) for order in self.ordering)
+
+    @staticmethod
+    def _reverse(ordering):
+        return tuple(
+            order[1:] if order.startswith("-") else f"-{order}" for order in ordering
+        )
+
+    @staticmethod
+    def _seek(ordering, position):
+        """
+        Build the row comparison `(a, b) > (x, y)` as
+        `a > x OR (a = x AND b > y)`, honouring each term's direction.
+        """
+        condition = Q()
+        equal = {}
+        for order, value in zip(ordering, position):
+            name = order.lstrip("-")
+            lookup = "lt" if order.startswith("-") else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
+
+
+class LargeKeysetPagination(KeysetPagination):
+    page_size = 1000
+    max_page_size = 10000
@@ -1,8 +1,14 @@
+from collections.abc import Iterator
+
 from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+SHORT_SEPARATORS = (",", ":")
+LONG_SEPARATORS = (", ", ": ")
 
 
 class CustomRenderer(JSONRenderer):
-    def render(self, data, accepted_media_type=None, renderer_context=None):
+    def get_envelope(self, data, renderer_context):
         status_code = renderer_context["response"].status_code
         response = {"data": data, "error": None}
 
@@ -10,6 +16,100 @@ class CustomRenderer(JSONRenderer):
             response["error"] = data
             response["data"] = None
 
+        return response
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        response = self.get_envelope(data, renderer_context)
+
         return super(CustomRenderer, self).render(
             response, accepted_media_type, renderer_context
         )
+
+
+class StreamingRenderer(CustomRenderer):
+    """
+    CustomRenderer that can also encode the envelope incrementally.
+
+    `render_stream` walks the envelope and writes lists and generators one
+    item at a time, so result rows are encoded as they are produced and
+    only `chunk_size` bytes of output are buffered. The bytes match
+    `CustomRenderer.render` for the same data.
+    """
+
+    chunk_size = 64 * 1024
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return b"".join(self.render_stream(data, accepted_media_type, renderer_context))
+
+    def render_stream(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        envelope = self.get_envelope(data, renderer_context)
+
+        if self.get_indent(accepted_media_type, renderer_context) is not None:
+            # Pretty printing is for humans, no need to stream it
+            yield super().render(
+                _materialize(data), accepted_media_type, renderer_context
+            )
+            return
+
+        encoder = self.encoder_class(
+            ensure_ascii=self.ensure_ascii,
+            allow_nan=not self.strict,
+            separators=SHORT_SEPARATORS if self.compact else LONG_SEPARATORS,
+        )
+
+        buffer, size = [], 0
+        for chunk in self._iterencode(envelope, encoder):
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= self.chunk_size:
+                yield self._encode(buffer)
+                buffer, size = [], 0
+
+        if buffer:
+            yield self._encode(buffer)
+
+    def _iterencode(self, obj, encoder: JSONEncoder):
+        item_separator, key_separator = encoder.item_separator, encoder.key_separator
+
+        if isinstance(obj, dict) and any(map(_is_container, obj.values())):
+            yield "{"
+            for index, (key, value) in enumerate(obj.items()):
+                if index:
+                    yield item_separator
+                # Non-string keys are coerced the way json.dumps does it
+                yield encoder.encode(
+                    key if isinstance(key, str) else encoder.encode(key)
+                )
+                yield key_separator
+                yield from self._iterencode(value, encoder)
+            yield "}"
+
+        elif isinstance(obj, (list, tuple, Iterator)):
+            yield "["
+            for index, item in enumerate(obj):
+                if index:
+                    yield item_separator
+                yield from self._iterencode(item, encoder)
+            yield "]"
+
+        else:
+            yield encoder.encode(obj)
+
+    @staticmethod
+    def _encode(buffer):
+        ret = "".join(buffer)
+        ret = ret.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029")
+        return ret.encode()
+
+
+def _is_container(value) -> bool:
+    return isinstance(value, (dict, list, tuple, Iterator))
+
+
+def _materialize(data):
+    if isinstance(data, dict):
+        return {key: _materialize(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple, Iterator)):
+        return [_materialize(item) for item in data]
+    return data
@@ -0,0 +1,164 @@
+"""
+Read replica routing.
+
+Replicas are listed in `settings.DATABASE_REPLICAS` (alias -> weight). Reads
+only go to them when asked for: `ReplicaReadMixin` and
+`ReplicaChangeListMixin` point the querysets of views that tolerate
+replication lag at `replica_for(request)`, and `replica_reads()` routes
+any read made inside it. Everything else, and every read after a write,
+uses the primary:
+
+- a write pins the rest of the request to the primary;
+- `ReplicaPinMiddleware` keeps the client pinned for
+  `DATABASE_REPLICA_PIN_SECONDS` through a cookie, and through a cache key
+  for authenticated users whose clients drop cookies.
+"""
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+
+_state = ContextVar("replica_routing", default=None)
+
+
+@dataclass
+class RoutingState:
+    """Routing flags of the current request, mutated in place"""
+
+    pinned: bool = False
+    replica_reads: bool = False
+    wrote: bool = False
+
+
+def get_state():
+    return _state.get()
+
+
+@contextmanager
+def routing_state(pinned=False):
+    token = _state.set(RoutingState(pinned=pinned))
+    try:
+        yield _state.get()
+    finally:
+        _state.reset(token)
+
+
+@contextmanager
+def replica_reads():
+    """Allow reads to go to replicas unless pinned to the primary"""
+    state = get_state()
+    if state is None:
+        with routing_state() as state:
+            state.replica_reads = True
+            yield
+        return
+
+    previous, state.replica_reads = state.replica_reads, True
+    try:
+        yield
+    finally:
+        state.replica_reads = previous
+
+
+class ReplicaHealth:
+    """Process-wide cache of replica reachability, rechecked every `ttl` seconds"""
+
+    def __init__(self, ttl: float = 30):
+        self.ttl = ttl
+        self._checked = {}
+        self._lock = threading.Lock()
+
+    def is_healthy(self, alias) -> bool:
+        now = time.monotonic()
+        healthy, checked_at = self._checked.get(alias, (True, None))
+        if checked_at is not None and now - checked_at < self.ttl:
+            return healthy
+
+        try:
+            connections[alias].ensure_connection()
+            healthy = True
+        except DatabaseError:
+            healthy = False
+
+        with self._lock:
+            self._checked[alias] = (healthy, now)
+        return healthy
+
+    def mark_unhealthy(self, alias):
+        with self._lock:
+            self._checked[alias] = (False, time.monotonic())
+
+    def clear(self):
+        with self._lock:
+            self._checked.clear()
+
+
+health = ReplicaHealth()
+
+
+def choose_replica():
+    """A healthy replica picked by weight, None when there is none"""
+    replicas = {
+        alias: weight
+        for alias, weight in settings.DATABASE_REPLICAS.items()
+        if weight > 0 and health.is_healthy(alias)
+    }
+    if not replicas:
+        return None
+    return random.choices(list(replicas), weights=list(replicas.values()))[0]
+
+
+def pin_key(user_id) -> str:
+    return f"replica-pin:{user_id}"
+
+
+def pin_user(user):
+    cache.set(pin_key(user.pk), True, settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+def is_user_pinned(user) -> bool:
+    return bool(user.is_authenticated and cache.get(pin_key(user.pk)))
+
+
+def replica_for(request):
+    """Replica to serve `request`'s reads from, None to stay on the primary"""
+    if not settings.DATABASE_REPLICAS:
+        return None
+
+    state = get_state()
+    if state is not None and (state.pinned or state.wrote):
+        return None
+
+    user = getattr(request, "user", None)
+    if user is not None and is_user_pinned(user):
+        return None
+
+    return choose_replica()
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = get_state()
+        if state is None or not state.replica_reads or state.pinned or state.wrote:
+            return None
+        return choose_replica()
+
+    def db_for_write(self, model, **hints):
+        if (state := get_state()) is not None:
+            state.wrote = True
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,124 @@
+from typing import NamedTuple
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import models
+from rest_framework import serializers
+
+# Fields whose representation is the database value itself
+IDENTITY_FIELDS = (
+    serializers.CharField,
+    serializers.BooleanField,
+    serializers.IntegerField,
+)
+
+
+class ReadPlan(NamedTuple):
+    names: tuple
+    columns: tuple
+    uuid_positions: tuple
+    converters: tuple
+
+
+class ValuesListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        return self.child.to_representation_many(data)
+
+
+class ValuesSerializer(serializers.ModelSerializer):
+    """
+    Read-only ModelSerializer that renders `values_list()` rows.
+
+    The field plan (columns to fetch and how to convert each one) is compiled
+    once per class from the declared fields. Rows are turned into plain dicts
+    column by column, with UUIDs stringified in a single pass. Use `values()`
+    to build the queryset it expects. Subclasses keep the Meta inheritance:
+
+        class Meta(ValuesSerializer.Meta):
+            model = User
+            fields = ["email", "name", "id"]
+    """
+
+    class Meta:
+        list_serializer_class = ValuesListSerializer
+
+    @classmethod
+    def get_plan(cls) -> ReadPlan:
+        plan = cls.__dict__.get("_plan")
+        if plan is None:
+            plan = cls._plan = cls.compile_plan()
+        return plan
+
+    @classmethod
+    def compile_plan(cls) -> ReadPlan:
+        model = cls.Meta.model
+        names, columns, uuid_positions, converters = [], [], [], []
+
+        readable = [
+            (name, field)
+            for name, field in cls().fields.items()
+            if not field.write_only
+        ]
+        for position, (name, field) in enumerate(readable):
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                model_field = None
+
+            if (
+                model_field is None
+                or not model_field.concrete
+                or model_field.many_to_many
+            ):
+                raise ImproperlyConfigured(
+                    f"{cls.__name__}.{name} must map to a concrete column of {model.__name__}."
+                )
+
+            names.append(name)
+            columns.append(model_field.name)
+            target = (
+                model_field.target_field if model_field.is_relation else model_field
+            )
+
+            if isinstance(target, models.UUIDField):
+                uuid_positions.append(position)
+            elif not model_field.is_relation and not isinstance(field, IDENTITY_FIELDS):
+                converters.append((position, field.to_representation))
+
+        return ReadPlan(
+            tuple(names), tuple(columns), tuple(uuid_positions), tuple(converters)
+        )
+
+    @classmethod
+    def values(cls, queryset, extra=()):
+        """
+        Return `queryset` as named `values_list()` rows holding the plan's
+        columns followed by any `extra` ones (eg. pagination keys).
+        """
+        plan = cls.get_plan()
+        pk_name = queryset.model._meta.pk.name
+        extra = dict.fromkeys(pk_name if name == "pk" else name for name in extra)
+        extra = [name for name in extra if name not in plan.columns]
+        return queryset.values_list(*plan.columns, *extra, named=True)
+
+    def to_representation(self, row):
+        return self.to_representation_many([row])[0]
+
+    def to_representation_many(self, rows):
+        rows = list(rows)
+        if not rows:
+            return []
+
+        plan = self.get_plan()
+        columns = list(zip(*rows))[: len(plan.names)]
+
+        for position in plan.uuid_positions:
+            columns[position] = [
+                None if v is None else str(v) for v in columns[position]
+            ]
+
+        for position, convert in plan.converters:
+            columns[position] = [
+                None if v is None else convert(v) for v in columns[position]
+            ]
+
+        return [dict(zip(plan.names, values)) for values in zip(*columns)]
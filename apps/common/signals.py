@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent by BaseQuerySet's bulk updates once per chunk, inside its transaction,
+# with `pks` (the updated primary keys), `values` (the fields set) and `using`.
+# QuerySet.update() sends no post_save, receivers of that must listen here too.
+bulk_updated = Signal()
@@ -0,0 +1,134 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls.base import reverse
+from rest_framework import status
+
+from apps.common.authentication import ClaimsUser, RefreshToken, get_model_user
+from apps.common.cache import LRUCache
+from apps.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+def user_queries(queries):
+    return [q for q in queries if 'FROM "users_user"' in q["sql"]]
+
+
+@pytest.fixture
+def bearer_client(api_client, token):
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token['access']}")
+    return api_client
+
+
+class TestJWTAuthentication:
+    def get_me(self, client):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = client.get(reverse("api:users-me"))
+        assert resp.status_code == status.HTTP_200_OK
+        return resp.json(), user_queries(ctx.captured_queries)
+
+    def test_db_mode_loads_user(self, settings, bearer_client, user):
+        settings.JWT_USER_RESOLUTION = "db"
+
+        data, queries = self.get_me(bearer_client)
+
+        assert data["email"] == user.email
+        assert len(queries) == 1
+
+    def test_claims_mode_skips_database(self, settings, bearer_client, user):
+        settings.JWT_USER_RESOLUTION = "claims"
+
+        data, queries = self.get_me(bearer_client)
+
+        assert data == {"email": user.email, "name": user.name, "id": str(user.id)}
+        assert queries == []
+
+    def test_claims_mode_rejects_inactive_claim(self, settings, api_client, user):
+        settings.JWT_USER_RESOLUTION = "claims"
+        user.is_active = False
+        access = RefreshToken.for_user(user).access_token
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        resp = api_client.get(reverse("api:users-me"))
+
+        assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_claims_mode_rejects_deleted_claim(self, settings, api_client, user):
+        settings.JWT_USER_RESOLUTION = "claims"
+        user.deleted = True
+        access = RefreshToken.for_user(user).access_token
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        resp = api_client.get(reverse("api:users-me"))
+
+        assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_claims_mode_user_deleted_after_login(
+        self, settings, bearer_client, user, test_password
+    ):
+        settings.JWT_USER_RESOLUTION = "claims"
+        User.objects.filter(pk=user.pk).soft_delete()
+        data = {"old_password": test_password, "new_password": "new_password"}
+
+        resp = bearer_client.post(reverse("api:change-password"), data=data)
+
+        assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_cache_mode_reuses_user(self, settings, bearer_client, user):
+        settings.JWT_USER_RESOLUTION = "cache"
+
+        _, first = self.get_me(bearer_client)
+        _, second = self.get_me(bearer_client)
+
+        assert len(first) == 1
+        assert second == []
+
+    def test_cache_mode_invalidated_on_save(self, settings, bearer_client, user):
+        settings.JWT_USER_RESOLUTION = "cache"
+        self.get_me(bearer_client)
+
+        user.name = "Renamed"
+        user.save()
+        data, queries = self.get_me(bearer_client)
+
+        assert data["name"] == "Renamed"
+        assert len(queries) == 1
+
+    def test_change_password_with_claims_user(
+        self, settings, bearer_client, user, test_password
+    ):
+        settings.JWT_USER_RESOLUTION = "claims"
+        data = {"old_password": test_password, "new_password": "new_password"}
+
+        resp = bearer_client.post(reverse("api:change-password"), data=data)
+
+        assert resp.status_code == status.HTTP_201_CREATED
+        user.refresh_from_db()
+        assert user.check_password("new_password")
+
+    def test_get_model_user(self, user):
+        claims_user = ClaimsUser(RefreshToken.for_user(user).access_token)
+
+        assert get_model_user(claims_user) == user
+        assert get_model_user(user) is user
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_expires_entries(self):
+        cache = LRUCache(ttl=0)
+        cache.set("a", User())
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
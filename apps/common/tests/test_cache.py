@@ -0,0 +1,72 @@
+import threading
+import time
+
+from django.core.cache import cache
+
+from apps.common import cache as cache_utils
+from apps.common.cache import get_or_compute, serializer_cache_key
+from apps.users.serializers import UserReadSerializer, UserSerializer
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.calls
+
+
+class TestGetOrCompute:
+    def test_computes_once_while_fresh(self):
+        compute = Counter()
+
+        assert get_or_compute("key", compute, fresh_for=60) == 1
+        assert get_or_compute("key", compute, fresh_for=60) == 1
+        assert compute.calls == 1
+
+    def test_stale_value_recomputed_by_one_caller(self):
+        compute = Counter()
+        get_or_compute("key", compute, fresh_for=0, stale_for=60)
+
+        # another caller is refreshing it, serve the stale value
+        cache.add("key:lock", 1)
+        assert get_or_compute("key", compute, fresh_for=0, stale_for=60) == 1
+        cache.delete("key:lock")
+
+        assert get_or_compute("key", compute, fresh_for=0, stale_for=60) == 2
+        assert cache.get("key:lock") is None
+
+    def test_cold_key_waits_for_lock_holder(self):
+        compute = Counter()
+        cache.add("key:lock", 1)
+
+        def lock_holder():
+            time.sleep(0.1)
+            cache.set("key", ("computed elsewhere", time.time() + 60))
+
+        thread = threading.Thread(target=lock_holder)
+        thread.start()
+        assert get_or_compute("key", compute, fresh_for=60) == "computed elsewhere"
+        thread.join()
+        assert compute.calls == 0
+
+    def test_cold_key_computes_when_lock_expires(self, monkeypatch):
+        monkeypatch.setattr(cache_utils, "LOCK_TIMEOUT", 0.1)
+        cache.add("key:lock", 1)
+
+        assert get_or_compute("key", Counter(), fresh_for=60) == 1
+
+
+class TestSerializerCacheKey:
+    def test_depends_on_serializer_and_version(self, monkeypatch):
+        key = serializer_cache_key(UserSerializer, 1)
+
+        assert key.startswith("UserSerializer:")
+        assert key.endswith(":1")
+        assert key != serializer_cache_key(UserReadSerializer, 1)
+
+        cache_utils.serializer_version.cache_clear()
+        monkeypatch.setattr(UserSerializer, "cache_version", 2, raising=False)
+        assert serializer_cache_key(UserSerializer, 1) != key
+        cache_utils.serializer_version.cache_clear()
@@ -0,0 +1,20 @@
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.skipif(
+    connection.vendor == "postgresql", reason="needs a non PostgreSQL database"
+)
+def test_requires_postgresql():
+    with pytest.raises(CommandError, match="no connection pool"):
+        call_command("db_pool_status")
+
+
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="needs PostgreSQL")
+def test_reports_server_connections(capsys):
+    call_command("db_pool_status")
+
+    assert "Server: " in capsys.readouterr().out
@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+
+from apps.common.email import send_email_template_bulk
+from apps.users.models import User
+from apps.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class StatusBackend(EmailBackend):
+    """locmem backend reporting Anymail statuses, bounce@ is rejected and down@ errors"""
+
+    def send_messages(self, messages):
+        for message in messages:
+            if any(email.startswith("down@") for email in message.to):
+                raise ConnectionError("provider unavailable")
+
+            message.anymail_status = SimpleNamespace(
+                recipients={
+                    email: SimpleNamespace(
+                        status="rejected" if email.startswith("bounce@") else "queued"
+                    )
+                    for email in message.to
+                }
+            )
+        return super().send_messages(messages)
+
+
+class TestSendEmailTemplateBulk:
+    def test_batches_recipients(self, django_assert_num_queries):
+        UserFactory.create_batch(5)
+
+        with django_assert_num_queries(1):
+            sent, failed = send_email_template_bulk(
+                User.objects.order_by("email"),
+                "d-template",
+                get_template_data=lambda user: {"name": user.name},
+                global_template_data={"product": "app"},
+                batch_size=2,
+            )
+
+        assert (sent, failed) == (5, {})
+        assert [len(msg.to) for msg in mail.outbox] == [2, 2, 1]
+
+        msg = mail.outbox[0]
+        assert msg.template_id == "d-template"
+        assert msg.merge_global_data == {"product": "app"}
+        assert msg.merge_data == {
+            user.email: {"name": user.name}
+            for user in User.objects.order_by("email")[:2]
+        }
+
+    def test_batch_size_capped_at_provider_limit(self):
+        users = [User(email=f"user{i}@example.com") for i in range(1001)]
+
+        sent, _ = send_email_template_bulk(users, "d-template", batch_size=5000)
+
+        assert sent == 1001
+        assert [len(msg.to) for msg in mail.outbox] == [1000, 1]
+
+    def test_reports_failed_recipients(self, settings):
+        settings.EMAIL_BACKEND = "apps.common.tests.test_email.StatusBackend"
+        users = [
+            User(email="ok@example.com"),
+            User(email="bounce@example.com"),
+            User(email="down@example.com"),
+        ]
+
+        sent, failed = send_email_template_bulk(users, "d-template", batch_size=2)
+
+        assert sent == 1
+        assert failed == {
+            "bounce@example.com": "rejected",
+            "down@example.com": "provider unavailable",
+        }
+        assert len(mail.outbox) == 1
@@ -0,0 +1,151 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.urls.base import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from apps.common import email_dispatch
+from apps.common.email import send_email
+from apps.common.email_dispatch import EmailWorkerPool, deliver, dispatch, send_queued
+from apps.common.models import QueuedEmail
+
+pytestmark = pytest.mark.django_db
+
+FAILING_BACKEND = "apps.common.tests.test_email_dispatch.FailingBackend"
+
+
+class FailingBackend(EmailBackend):
+    """locmem backend refusing messages to fail@example.com"""
+
+    opened = 0
+
+    def open(self):
+        FailingBackend.opened += 1
+        return super().open()
+
+    def send_messages(self, messages):
+        if any("fail@example.com" in message.to for message in messages):
+            raise ConnectionError("rejected")
+        return super().send_messages(messages)
+
+
+def make_message(to="user@example.com"):
+    return EmailMessage("Subject", "Body", to=[to])
+
+
+class TestDispatch:
+    def test_sync_sends_immediately(self, settings):
+        settings.EMAIL_DISPATCH_MODE = "sync"
+
+        assert send_email("user@example.com", "Subject", "Body") == 1
+        assert len(mail.outbox) == 1
+
+    def test_thread_submits_after_commit(
+        self, settings, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        settings.EMAIL_DISPATCH_MODE = "thread"
+        submitted = []
+        monkeypatch.setattr(email_dispatch.pool, "submit", submitted.append)
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            dispatch(make_message())
+            assert submitted == []
+
+        assert len(callbacks) == 1
+        assert len(submitted) == 1
+        assert len(mail.outbox) == 0
+
+    def test_queue_stores_message(self, settings):
+        settings.EMAIL_DISPATCH_MODE = "queue"
+        message = make_message()
+        message.template_id = "d-123"
+        message.dynamic_template_data = {"code": "1234"}
+
+        dispatch(message)
+
+        queued = QueuedEmail.objects.get()
+        assert queued.payload["to"] == ["user@example.com"]
+        assert queued.payload["template_id"] == "d-123"
+        assert len(mail.outbox) == 0
+
+    def test_forget_password_does_not_send_in_request(self, settings, api_client, user):
+        settings.EMAIL_DISPATCH_MODE = "queue"
+
+        resp = api_client.post(
+            reverse("api:forget-password"), data={"email": user.email}
+        )
+
+        assert resp.status_code == status.HTTP_200_OK
+        assert len(mail.outbox) == 0
+        assert QueuedEmail.objects.count() == 1
+
+
+class TestDelivery:
+    def test_deliver_reuses_connection(self, settings):
+        settings.EMAIL_BACKEND = FAILING_BACKEND
+        FailingBackend.opened = 0
+
+        failed = deliver(
+            [make_message(), make_message("fail@example.com"), make_message()]
+        )
+
+        assert FailingBackend.opened == 1
+        assert [message.to for message, _ in failed] == [["fail@example.com"]]
+        assert len(mail.outbox) == 2
+
+    def test_pool_drain_sends_batches(self, monkeypatch):
+        pool = EmailWorkerPool(batch_size=2)
+        monkeypatch.setattr(pool, "start", lambda: None)
+        for _ in range(3):
+            pool.submit(make_message())
+
+        pool.drain()
+
+        assert len(mail.outbox) == 3
+
+    def test_send_queued(self, settings):
+        settings.EMAIL_DISPATCH_MODE = "queue"
+        dispatch(make_message())
+        dispatch(make_message())
+
+        assert send_queued() == (2, 0)
+        assert len(mail.outbox) == 2
+        assert not QueuedEmail.objects.exclude(status=QueuedEmail.Status.SENT).exists()
+        assert send_queued() == (0, 0)
+
+    def test_send_queued_retries_with_backoff(self, settings):
+        settings.EMAIL_DISPATCH_MODE = "queue"
+        settings.EMAIL_BACKEND = FAILING_BACKEND
+        settings.EMAIL_DISPATCH_MAX_ATTEMPTS = 2
+        dispatch(make_message("fail@example.com"))
+
+        assert send_queued() == (0, 1)
+        queued = QueuedEmail.objects.get()
+        assert queued.status == QueuedEmail.Status.PENDING
+        assert queued.attempts == 1
+        assert queued.next_attempt_at > timezone.now()
+        assert queued.last_error == "rejected"
+
+        # not due yet
+        assert send_queued() == (0, 0)
+
+        QueuedEmail.objects.update(
+            next_attempt_at=timezone.now() - timedelta(seconds=1)
+        )
+        assert send_queued() == (0, 1)
+        queued.refresh_from_db()
+        assert queued.status == QueuedEmail.Status.FAILED
+
+    def test_command(self, settings, capsys):
+        settings.EMAIL_DISPATCH_MODE = "queue"
+        dispatch(make_message())
+
+        call_command("send_queued_emails")
+
+        assert "Sent 1 emails, 0 failed" in capsys.readouterr().out
+        assert len(mail.outbox) == 1
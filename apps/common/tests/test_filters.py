@@ -0,0 +1,70 @@
+import pytest
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.common.filters import IndexedSearchFilter
+from apps.users.models import User
+from apps.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+factory = APIRequestFactory()
+
+
+class View:
+    search_fields = ["email", "@name"]
+    search_vectors = {"name": "name_search"}
+
+
+def search(term, queryset=None):
+    request = Request(factory.get("/users/", {"search": term}))
+    queryset = User.objects.all() if queryset is None else queryset
+    return IndexedSearchFilter().filter_queryset(request, queryset, View())
+
+
+class TestIndexedSearchFilter:
+    def test_fallback_matches_substrings(self):
+        robert = UserFactory(name="Robert Smith", email="rs@example.com")
+        UserFactory(name="Alice Jones", email="aj@example.com")
+
+        assert list(search("obert")) == [robert]
+        assert list(search("RS@EXAMPLE")) == [robert]
+        assert list(search("robert smith")) == [robert]
+        assert list(search("robert jones")) == []
+
+    @pytest.mark.skipif(
+        connection.vendor != "postgresql", reason="stored vectors are PostgreSQL only"
+    )
+    def test_postgresql_matches_word_prefixes(self):
+        robert = UserFactory(name="Robert Smith", email="rs@example.com")
+        bob = UserFactory(name="Bob Roberts", email="bob@example.com")
+        UserFactory(name="Alice Jones", email="aj@example.com")
+
+        assert set(search("rob")) == {robert, bob}
+        assert list(search("SMI")) == [robert]
+        # Unlike the fallback, "@name" does not match inside words
+        assert list(search("obert")) == []
+        assert list(search("o'rob\\")) == []
+
+    def test_no_terms(self):
+        UserFactory.create_batch(2)
+
+        assert search("").count() == 2
+
+    def test_postgresql_uses_stored_vector(self, monkeypatch):
+        monkeypatch.setattr(
+            IndexedSearchFilter,
+            "get_search_vectors",
+            lambda self, view, qs: view.search_vectors,
+        )
+
+        sql = str(search("rob").query)
+
+        assert '"users_user"."name_search" @@ to_tsquery' in sql
+        assert '"users_user"."email" LIKE' in sql
+
+    def test_prefix_query_escapes_quotes_and_backslashes(self):
+        query = IndexedSearchFilter.prefix_query("o'brien\\")
+
+        assert query == "'o''brien\\\\':*"
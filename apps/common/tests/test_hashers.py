@@ -0,0 +1,88 @@
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+
+from apps.common import hashers
+from apps.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def pbkdf2(settings):
+    settings.PASSWORD_HASHERS = ["apps.common.hashers.PBKDF2PasswordHasher"]
+    settings.PASSWORD_HASHER_ITERATIONS = 1000
+    return settings
+
+
+class TestHashing:
+    def test_runs_on_pool(self, settings):
+        settings.PASSWORD_HASHING_WORKERS = 2
+
+        name = hashers._run(lambda: threading.current_thread().name)
+
+        assert name.startswith("password-hasher")
+
+    def test_runs_inline_without_workers(self, settings):
+        settings.PASSWORD_HASHING_WORKERS = 0
+
+        assert hashers._run(threading.current_thread) is threading.current_thread()
+
+    def test_iterations_from_settings(self, pbkdf2):
+        encoded = hashers.make_password("password")
+
+        assert encoded.startswith("pbkdf2_sha256$1000$")
+        assert hashers.check_password("password", encoded) == (True, None)
+        assert hashers.check_password("wrong", encoded) == (False, None)
+
+    def test_rehash_when_iterations_change(self, pbkdf2, user):
+        user.set_password("password")
+        user.save()
+
+        pbkdf2.PASSWORD_HASHER_ITERATIONS = 2000
+        assert user.check_password("password")
+
+        user.refresh_from_db()
+        assert user.password.startswith("pbkdf2_sha256$2000$")
+
+    def test_async_check_rehashes(self, pbkdf2, user):
+        async_to_sync(user.aset_password)("password")
+        user.save()
+
+        pbkdf2.PASSWORD_HASHER_ITERATIONS = 2000
+        assert async_to_sync(user.acheck_password)("password")
+        assert not async_to_sync(user.acheck_password)("wrong")
+
+        user.refresh_from_db()
+        assert user.password.startswith("pbkdf2_sha256$2000$")
+
+    def test_no_rehash_for_wrong_password(self, pbkdf2, user):
+        user.set_password("password")
+        user.save()
+        encoded = user.password
+
+        pbkdf2.PASSWORD_HASHER_ITERATIONS = 2000
+        assert not user.check_password("wrong")
+        assert User.objects.get(pk=user.pk).password == encoded
+
+
+class TestCalibratePasswordHasher:
+    def test_recommends_iterations(self, pbkdf2, capsys):
+        call_command("calibrate_password_hasher", "--samples=1", "--allow-weaker")
+
+        out = capsys.readouterr().out
+        assert "1000 iterations" in out
+        assert "Recommended: PASSWORD_HASHER_ITERATIONS=" in out
+
+    def test_writes_env(self, pbkdf2, tmp_path):
+        pbkdf2.BASE_DIR = tmp_path
+        (tmp_path / ".env").write_text("DEBUG=on\nPASSWORD_HASHER_ITERATIONS=1\n")
+
+        call_command("calibrate_password_hasher", "--samples=1", "--write")
+
+        lines = (tmp_path / ".env").read_text().splitlines()
+        assert lines[0] == "DEBUG=on"
+        assert lines[1].startswith("PASSWORD_HASHER_ITERATIONS=")
+        assert int(lines[1].split("=")[1]) >= 870000
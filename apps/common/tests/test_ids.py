@@ -0,0 +1,57 @@
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from apps.common.ids import generate_id, uuid7, uuid7_bound, uuid7_timestamp
+from apps.users.models import User
+from apps.users.tests.factories import UserFactory
+
+
+class TestUUID7:
+    def test_layout(self):
+        value = uuid7()
+
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+
+    def test_ordered_within_a_millisecond(self, monkeypatch):
+        monkeypatch.setattr(time, "time_ns", lambda: 1_700_000_000_000_000_000)
+        ids = [uuid7() for _ in range(5000)]
+
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+
+    def test_timestamp(self):
+        moment = datetime(2026, 1, 2, 3, 4, 5, 6000, tzinfo=timezone.utc)
+        value = uuid7(timestamp_ms=int(moment.timestamp() * 1000))
+
+        assert uuid7_timestamp(value) == moment
+        assert uuid7_timestamp(str(value)) == moment
+        assert uuid7_timestamp(uuid.uuid4()) is None
+
+    def test_bound(self):
+        moment = datetime.now(timezone.utc)
+        value = uuid7()
+
+        assert uuid7_bound(moment - timedelta(seconds=1)) <= value
+        assert value < uuid7_bound(moment + timedelta(seconds=1))
+
+    def test_setting(self, settings):
+        settings.USE_UUID7_PRIMARY_KEYS = False
+        assert generate_id().version == 4
+
+        settings.USE_UUID7_PRIMARY_KEYS = True
+        assert generate_id().version == 7
+
+
+@pytest.mark.django_db
+def test_id_range_scan(settings):
+    settings.USE_UUID7_PRIMARY_KEYS = True
+    start = datetime.now(timezone.utc) - timedelta(seconds=1)
+    users = UserFactory.create_batch(3)
+
+    queryset = User.objects.filter(id__gte=uuid7_bound(start)).order_by("id")
+
+    assert list(queryset) == users
@@ -0,0 +1,111 @@
+import pytest
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls.base import reverse
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.views import APIView
+from rest_framework.viewsets import ViewSet
+
+from apps.common.decorators import atomic_request, autocommit_request
+from apps.common.middleware import SelectiveAtomicRequestsMiddleware
+from apps.users.models import User
+from apps.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def savepoint_depth(request):
+    # The test itself runs in a transaction, atomic views add a savepoint
+    return HttpResponse(str(len(connection.savepoint_ids)))
+
+
+def create_and_fail(request):
+    UserFactory()
+    raise RuntimeError("boom")
+
+
+class CreateAndRejectView(APIView):
+    authentication_classes = []
+    permission_classes = []
+
+    def post(self, request):
+        UserFactory()
+        raise serializers.ValidationError("rejected")
+
+
+class DepthViewSet(ViewSet):
+    authentication_classes = []
+    permission_classes = []
+
+    def list(self, request):
+        return savepoint_depth(request)
+
+    @atomic_request
+    @action(detail=False)
+    def locked(self, request):
+        return savepoint_depth(request)
+
+
+@pytest.fixture
+def run():
+    factory = RequestFactory()
+    middleware = SelectiveAtomicRequestsMiddleware(lambda request: None)
+
+    def run_view(view, method="get"):
+        request = getattr(factory, method)("/")
+        response = middleware.process_view(request, view, (), {})
+        if response is None:
+            response = view(request)
+        return response
+
+    return run_view
+
+
+class TestSelectiveAtomicRequests:
+    def depth(self, response):
+        return int(response.content) - len(connection.savepoint_ids)
+
+    def test_safe_methods_autocommit(self, run):
+        assert self.depth(run(savepoint_depth)) == 0
+
+    def test_unsafe_methods_atomic(self, run):
+        assert self.depth(run(savepoint_depth, "post")) == 1
+
+    def test_decorators(self, run):
+        assert self.depth(run(atomic_request(savepoint_depth))) == 1
+        assert self.depth(run(autocommit_request(savepoint_depth), "post")) == 0
+
+    def test_viewset_actions(self, run):
+        assert self.depth(run(DepthViewSet.as_view({"get": "list"}))) == 0
+        assert self.depth(run(DepthViewSet.as_view({"get": "locked"}))) == 1
+
+    def test_exception_rolls_back(self, run):
+        with pytest.raises(RuntimeError):
+            run(create_and_fail, "post")
+
+        assert not User.objects.exists()
+
+    def test_handled_drf_exception_rolls_back(self, run):
+        response = run(CreateAndRejectView.as_view(), "post")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not User.objects.exists()
+
+    def test_get_skips_transaction_round_trips(
+        self, monkeypatch, api_client_auth, user
+    ):
+        client = api_client_auth(user)
+        url = reverse("api:users-me")
+
+        with CaptureQueriesContext(connection) as autocommit:
+            client.get(url)
+
+        monkeypatch.setitem(connection.settings_dict, "ATOMIC_REQUESTS", True)
+        with CaptureQueriesContext(connection) as atomic:
+            client.get(url)
+
+        # SAVEPOINT and RELEASE SAVEPOINT here, BEGIN and COMMIT outside tests
+        assert len(atomic) - len(autocommit) == 2
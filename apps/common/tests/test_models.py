@@ -0,0 +1,81 @@
+import pytest
+from django.core.cache import cache
+
+from apps.common.authentication import user_cache
+from apps.common.cache import serializer_cache_key
+from apps.common.models import QueuedEmail
+from apps.common.signals import bulk_updated
+from apps.users.models import User
+from apps.users.serializers import UserSerializer
+from apps.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def chunks():
+    sent = []
+
+    def receiver(sender, pks, values, **kwargs):
+        sent.append((sender, sorted(pks), values))
+
+    bulk_updated.connect(receiver)
+    yield sent
+    bulk_updated.disconnect(receiver)
+
+
+class TestBaseQuerySet:
+    def test_deactivate_in_chunks(self, chunks):
+        users = UserFactory.create_batch(5)
+
+        assert User.objects.deactivate(chunk_size=2) == 5
+
+        assert not User.objects.filter(is_active=True).exists()
+        assert [len(pks) for _, pks, _ in chunks] == [2, 2, 1]
+        assert sorted(pk for _, pks, _ in chunks for pk in pks) == sorted(
+            u.pk for u in users
+        )
+        assert chunks[0][2] == {"is_active": False}
+
+    def test_skips_rows_in_target_state(self, chunks):
+        active = UserFactory()
+        inactive = UserFactory(is_active=False)
+        updated_at = inactive.updated_at
+
+        assert User.objects.deactivate() == 1
+
+        inactive.refresh_from_db()
+        assert inactive.updated_at == updated_at
+        assert chunks[0][1] == [active.pk]
+
+    def test_activate_touches_updated_at(self):
+        user = UserFactory(is_active=False)
+
+        assert User.objects.filter(pk=user.pk).activate() == 1
+
+        updated = User.objects.get(pk=user.pk)
+        assert updated.is_active
+        assert updated.updated_at > user.updated_at
+
+    def test_soft_delete(self):
+        user = UserFactory()
+
+        assert User.objects.soft_delete() == 1
+
+        user.refresh_from_db()
+        assert user.deleted and not user.is_active
+
+    def test_soft_delete_needs_deleted_field(self):
+        with pytest.raises(TypeError):
+            QueuedEmail.objects.soft_delete()
+
+    def test_invalidates_user_caches(self):
+        user = UserFactory()
+        key = serializer_cache_key(UserSerializer, user.pk)
+        cache.set(key, "cached")
+        user_cache.set(str(user.pk), user)
+
+        User.objects.deactivate()
+
+        assert cache.get(key) is None
+        assert user_cache.get(str(user.pk)) is None
@@ -0,0 +1,174 @@
+import pytest
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.common.pagination import (
+    EstimatedCountPaginator,
+    FastCountPagination,
+    KeysetPagination,
+    estimate_relation,
+)
+from apps.common.utils import CustomOrderingFilter
+from apps.users.models import User
+from apps.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+factory = APIRequestFactory()
+
+
+class UserListView:
+    filter_backends = [CustomOrderingFilter]
+    ordering_fields = ["created_at", "email", "name"]
+    ordering = None
+
+
+def paginate(url):
+    request = Request(factory.get(url))
+    paginator = KeysetPagination()
+    page = paginator.paginate_queryset(User.objects.all(), request, UserListView())
+    return paginator, page
+
+
+class TestKeysetPagination:
+    def test_walks_all_pages_without_gaps(self):
+        users = UserFactory.create_batch(5)
+        expected = [u.id for u in sorted(users, key=lambda u: (u.created_at, u.id))]
+
+        seen = []
+        paginator, page = paginate("/users/?page_size=2")
+        while True:
+            seen += [u.id for u in page]
+            if not (next_link := paginator.get_next_link()):
+                break
+            paginator, page = paginate(next_link)
+
+        assert seen == expected
+
+    def test_previous_link_returns_previous_page(self):
+        UserFactory.create_batch(5)
+        first, first_page = paginate("/users/?page_size=2")
+        second, _ = paginate(first.get_next_link())
+
+        _, page = paginate(second.get_previous_link())
+
+        assert [u.id for u in page] == [u.id for u in first_page]
+
+    def test_descending_ordering(self):
+        users = UserFactory.create_batch(3)
+        paginator, page = paginate("/users/?ordering=-email&page_size=3")
+
+        assert [u.email for u in page] == sorted((u.email for u in users), reverse=True)
+        assert paginator.ordering == ("-email",)
+
+    def test_rejects_unindexed_ordering(self):
+        with pytest.raises(ValidationError):
+            paginate("/users/?ordering=name")
+
+    def test_invalid_cursor(self):
+        with pytest.raises(NotFound):
+            paginate("/users/?cursor=cD1nYXJiYWdl")
+
+
+class EstimatedCountPagination(FastCountPagination):
+    estimate_count = True
+    estimate_threshold = 0
+
+
+class CachedCountPagination(FastCountPagination):
+    count_cache_timeout = 60
+
+
+class TestFastCountPagination:
+    def count(self, pagination_class, queryset):
+        paginator = pagination_class()
+        page = paginator.paginate_queryset(queryset, Request(factory.get("/users/")))
+        return paginator.get_paginated_response([u.id for u in page]).data
+
+    def test_exact_count_by_default(self):
+        UserFactory.create_batch(3)
+
+        data = self.count(FastCountPagination, User.objects.all())
+
+        assert data["count"] == 3
+        assert data["count_exact"] is True
+
+    def test_estimated_count_for_unfiltered_queryset(self):
+        UserFactory.create_batch(3)
+
+        data = self.count(EstimatedCountPagination, User.objects.all())
+
+        assert data["count"] >= 3
+        assert data["count_exact"] is False
+
+    def test_estimate_relation(self):
+        assert estimate_relation(User.all_objects.all()) == "users_user"
+        # Only the live manager's own filter, served by its partial index
+        assert estimate_relation(User.objects.all()) == "users_live_email_idx"
+        assert estimate_relation(User.objects.filter(is_active=True)) is None
+        assert estimate_relation(User.all_objects.filter(deleted=True)) is None
+
+    def test_filtered_queryset_counts_exactly(self):
+        user, *_ = UserFactory.create_batch(3)
+
+        data = self.count(EstimatedCountPagination, User.objects.filter(id=user.id))
+
+        assert data["count"] == 1
+        assert data["count_exact"] is True
+
+    def test_cached_count_skips_count_query(self, django_assert_num_queries):
+        UserFactory.create_batch(3)
+        queryset = User.objects.filter(is_active=True)
+        self.count(CachedCountPagination, queryset)
+        UserFactory()
+
+        # Only the page itself is fetched
+        with django_assert_num_queries(1):
+            data = self.count(CachedCountPagination, queryset)
+
+        assert data["count"] == 3
+
+
+class SmallEstimatedCountPaginator(EstimatedCountPaginator):
+    estimate_threshold = 1
+    count_limit = 2
+
+
+class TestEstimatedCountPaginator:
+    def test_estimates_unfiltered(self):
+        UserFactory.create_batch(3)
+        User.all_objects.first().delete()
+
+        # SQLite's MAX(rowid) still counts the deleted row
+        paginator = SmallEstimatedCountPaginator(User.all_objects.order_by("email"), 10)
+        assert paginator.count == 3
+
+    def test_caps_filtered_counts(self):
+        UserFactory.create_batch(3)
+
+        paginator = SmallEstimatedCountPaginator(
+            User.all_objects.filter(is_active=True), 10
+        )
+        assert paginator.count == 2
+        assert paginator.count_capped
+
+    def test_pages_past_the_cap(self):
+        users = UserFactory.create_batch(5)
+        queryset = User.all_objects.filter(is_active=True).order_by("email")
+        emails = sorted(user.email for user in users)
+
+        first = SmallEstimatedCountPaginator(queryset, 1)
+        assert (first.count, first.num_pages) == (2, 2)
+
+        # Counting restarts at the page shown, the next one stays in reach
+        page = SmallEstimatedCountPaginator(queryset, 1, page_number=3).page(3)
+        assert [user.email for user in page] == [emails[2]]
+        assert page.has_next() and page.paginator.count_capped
+
+        last = SmallEstimatedCountPaginator(queryset, 1, page_number=5)
+        assert (last.count, last.count_capped) == (5, False)
+        assert not last.page(5).has_next()
+
+    def test_lists(self):
+        assert SmallEstimatedCountPaginator([1, 2, 3], 10).count == 3
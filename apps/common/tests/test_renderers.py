@@ -0,0 +1,87 @@
+import json
+
+import pytest
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.common.renderers import CustomRenderer, StreamingRenderer
+from apps.users.views import UserView
+
+pytestmark = pytest.mark.django_db
+
+DATA = {
+    "count": 2,
+    "next": None,
+    "results": [
+        {"id": 1, "name": "Zo\u00eb\u2028", "tags": ["a", "b"]},
+        {"id": 2, "name": None, "nested": {"ok": True}},
+    ],
+}
+
+
+def context(status_code=200):
+    return {"response": Response(status=status_code)}
+
+
+class TestStreamingRenderer:
+    @pytest.mark.parametrize("status_code", [200, 400])
+    def test_matches_custom_renderer(self, status_code):
+        expected = CustomRenderer().render(DATA, None, context(status_code))
+
+        streamed = b"".join(
+            StreamingRenderer().render_stream(DATA, None, context(status_code))
+        )
+
+        assert streamed == expected
+
+    def test_encodes_generators(self):
+        rows = ({"id": i} for i in range(3))
+        renderer = StreamingRenderer()
+        renderer.chunk_size = 1
+
+        chunks = list(renderer.render_stream({"results": rows}, None, context()))
+
+        assert len(chunks) > 1
+        assert json.loads(b"".join(chunks)) == {
+            "data": {"results": [{"id": 0}, {"id": 1}, {"id": 2}]},
+            "error": None,
+        }
+
+    def test_indent_is_supported(self):
+        rows = ({"id": i} for i in range(2))
+        renderer = StreamingRenderer()
+
+        content = b"".join(
+            renderer.render_stream(
+                {"results": rows}, "application/json; indent=2", context()
+            )
+        )
+
+        assert content.startswith(b'{\n  "data"')
+
+
+class TestStreamingListMixin:
+    def get(self, user, renderer_classes):
+        view = UserView.as_view({"get": "list"}, renderer_classes=renderer_classes)
+        request = APIRequestFactory().get("/users/")
+        force_authenticate(request, user=user)
+        return view(request)
+
+    def test_streams_with_streaming_renderer(self, user):
+        response = self.get(user, [StreamingRenderer])
+
+        assert isinstance(response, StreamingHttpResponse)
+        assert response["Content-Type"] == "application/json"
+        payload = json.loads(b"".join(response.streaming_content))
+        assert payload["error"] is None
+        assert payload["data"]["results"] == [
+            {"email": user.email, "name": user.name, "id": str(user.id)}
+        ]
+
+    def test_falls_back_for_other_renderers(self, user):
+        response = self.get(user, [JSONRenderer])
+
+        assert not isinstance(response, StreamingHttpResponse)
+        assert response.status_code == 200
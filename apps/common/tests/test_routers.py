@@ -0,0 +1,96 @@
+import pytest
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.urls.base import reverse
+from rest_framework import status
+
+from apps.common import routers
+from apps.common.middleware import ReplicaPinMiddleware
+from apps.users.models import User
+from apps.users.tests.factories import UserFactory
+
+# The replica alias mirrors the test database through its own connection, so
+# rows must be committed to be visible there
+pytestmark = pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+
+
+@pytest.fixture
+def replica(settings):
+    settings.DATABASE_REPLICAS = {"replica": 1}
+    routers.health.clear()
+    yield "replica"
+    routers.health.clear()
+
+
+def replica_queries(func):
+    with CaptureQueriesContext(connections["replica"]) as ctx:
+        result = func()
+    return result, len(ctx.captured_queries)
+
+
+class TestReplicaRouter:
+    def test_reads_use_primary_by_default(self, replica):
+        assert User.objects.all().db == "default"
+
+    def test_replica_reads(self, replica):
+        with routers.replica_reads():
+            assert User.objects.all().db == "replica"
+
+    def test_write_pins_request_to_primary(self, replica):
+        with routers.routing_state(), routers.replica_reads():
+            UserFactory()
+            assert User.objects.all().db == "default"
+
+    def test_skips_unhealthy_and_zero_weight_replicas(self, settings, replica):
+        routers.health.mark_unhealthy("replica")
+        assert routers.choose_replica() is None
+
+        routers.health.clear()
+        settings.DATABASE_REPLICAS = {"replica": 0}
+        assert routers.choose_replica() is None
+
+    def test_no_migrations_on_replicas(self, replica):
+        router = routers.ReplicaRouter()
+
+        assert router.allow_migrate("replica", "users") is False
+        assert router.allow_migrate("default", "users") is None
+
+
+class TestReplicaViews:
+    @pytest.fixture
+    def client(self, api_client, token):
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token['access']}")
+        return api_client
+
+    def test_user_list_reads_replica(self, replica, client, user):
+        resp, queries = replica_queries(lambda: client.get(reverse("api:users-list")))
+
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.json()["results"][0]["email"] == user.email
+        assert queries > 0
+
+    def test_read_your_writes(self, replica, client, user):
+        url = reverse("api:users-detail", args=(user.id,))
+
+        resp = client.patch(url, data={"name": "Renamed"})
+        assert ReplicaPinMiddleware.cookie_name in resp.cookies
+
+        resp, queries = replica_queries(lambda: client.get(url))
+        assert resp.json()["name"] == "Renamed"
+        assert queries == 0
+
+        # Clients without the cookie are pinned through the cache
+        client.cookies.clear()
+        _, queries = replica_queries(lambda: client.get(url))
+        assert queries == 0
+
+    def test_admin_changelist_reads_replica(self, replica, client):
+        admin = UserFactory(is_staff=True, is_superuser=True)
+        client.force_login(admin)
+
+        resp, queries = replica_queries(
+            lambda: client.get(reverse("admin:users_user_changelist"))
+        )
+
+        assert resp.status_code == status.HTTP_200_OK
+        assert queries > 0
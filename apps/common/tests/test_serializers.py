@@ -0,0 +1,57 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+
+from apps.common.serializers import ValuesSerializer
+from apps.users.models import User
+from apps.users.serializers import UserReadSerializer, UserSerializer
+from apps.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestValuesSerializer:
+    def test_plan_is_compiled_once(self):
+        plan = UserReadSerializer.get_plan()
+
+        assert UserReadSerializer.get_plan() is plan
+        assert plan.columns == ("email", "name", "id")
+        assert plan.uuid_positions == (2,)
+
+    def test_matches_model_serializer(self):
+        UserFactory.create_batch(3)
+        queryset = User.objects.all()
+
+        rows = UserReadSerializer.values(queryset, extra=["pk", "created_at"])
+
+        assert UserReadSerializer(rows, many=True).data == (
+            UserSerializer(queryset, many=True).data
+        )
+
+    def test_single_row(self, user):
+        row = UserReadSerializer.values(User.objects.filter(id=user.id)).get()
+
+        assert UserReadSerializer(row).data == UserSerializer(user).data
+
+    def test_converts_non_identity_fields(self, user):
+        class Serializer(ValuesSerializer):
+            class Meta(ValuesSerializer.Meta):
+                model = User
+                fields = ["created_at"]
+
+        row = Serializer.values(User.objects.filter(id=user.id)).get()
+
+        assert Serializer(row).data == {
+            "created_at": serializers.DateTimeField().to_representation(user.created_at)
+        }
+
+    def test_rejects_computed_fields(self):
+        class Serializer(ValuesSerializer):
+            full_name = serializers.CharField(source="get_full_name")
+
+            class Meta(ValuesSerializer.Meta):
+                model = User
+                fields = ["full_name"]
+
+        with pytest.raises(ImproperlyConfigured):
+            Serializer.get_plan()
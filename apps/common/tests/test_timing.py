@@ -0,0 +1,161 @@
+import logging
+import re
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test import AsyncRequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls.base import reverse
+from rest_framework import status
+
+from apps.common import timing
+from apps.common.middleware import ServerTimingMiddleware
+from apps.users.async_views import MeView
+from apps.users.models import User
+from apps.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+TIMING_LOGGER = "apps.common.middleware"
+
+
+@pytest.fixture
+def client(api_client, token):
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token['access']}")
+    return api_client
+
+
+def parse_header(value):
+    return {
+        name: (float(duration), description)
+        for name, duration, description in re.findall(
+            r'(\w+);dur=([\d.]+)(?:;desc="([^"]*)")?', value
+        )
+    }
+
+
+class TestTiming:
+    def test_phase_outside_requests(self):
+        with timing.phase("auth"):
+            pass
+
+        assert timing.current() is None
+
+    def test_phases_accumulate(self):
+        with timing.recording() as timings:
+            with timing.phase("render"):
+                pass
+            timing.timed("render", lambda: None)()
+
+        assert list(timings.phases) == ["render"]
+        assert timings.header(0.5).endswith("total;dur=500.0")
+
+
+class TestServerTimingMiddleware:
+    url = reverse("api:users-list")
+
+    def test_unsampled(self, client, caplog):
+        with caplog.at_level(logging.INFO, logger=TIMING_LOGGER):
+            resp = client.get(self.url)
+
+        assert resp.status_code == status.HTTP_200_OK
+        assert "Server-Timing" not in resp
+        assert not caplog.records
+
+    def test_sampled(self, settings, client, caplog):
+        settings.SERVER_TIMING_SAMPLE_RATE = 1
+        settings.SERVER_TIMING_HEADER = True
+
+        with caplog.at_level(logging.INFO, logger=TIMING_LOGGER):
+            with CaptureQueriesContext(connection) as ctx:
+                resp = client.get(self.url)
+
+        metrics = parse_header(resp["Server-Timing"])
+        assert list(metrics) == ["db", "auth", "serialize", "render", "total"]
+        assert metrics["db"][1] == f"{len(ctx.captured_queries)} queries"
+
+        (record,) = caplog.records
+        assert record.levelno == logging.INFO
+        assert record.timing["path"] == self.url
+        assert record.timing["queries"] == len(ctx.captured_queries)
+        assert "auth_ms" in record.timing
+
+    def test_header_off_by_default(self, settings, client, caplog):
+        settings.SERVER_TIMING_SAMPLE_RATE = 1
+
+        with caplog.at_level(logging.INFO, logger=TIMING_LOGGER):
+            resp = client.get(self.url)
+
+        assert "Server-Timing" not in resp
+        assert len(caplog.records) == 1
+
+    def test_slow_requests_logged_unsampled(self, settings, client, caplog):
+        settings.SERVER_TIMING_SLOW_MS = 0
+
+        with caplog.at_level(logging.INFO, logger=TIMING_LOGGER):
+            resp = client.get(self.url)
+
+        (record,) = caplog.records
+        assert "Server-Timing" not in resp
+        assert record.levelno == logging.WARNING
+        assert set(record.timing) == {"method", "path", "status", "total_ms"}
+
+    def test_streaming_responses_logged_after_the_body(
+        self, settings, api_client_auth, caplog
+    ):
+        settings.SERVER_TIMING_SAMPLE_RATE = 1
+        settings.SERVER_TIMING_HEADER = True
+        UserFactory.create_batch(3)
+        client = api_client_auth(UserFactory(is_staff=True))
+
+        with caplog.at_level(logging.INFO, logger=TIMING_LOGGER):
+            resp = client.get(reverse("api:users-export"))
+            assert not caplog.records
+
+            with CaptureQueriesContext(connection) as ctx:
+                body = b"".join(resp.streaming_content)
+
+        assert body.count(b"\n") == 5
+        assert "Server-Timing" not in resp
+        (record,) = caplog.records
+        assert record.timing["queries"] == len(ctx.captured_queries) > 0
+        assert record.timing["stream_ms"] <= record.timing["total_ms"]
+
+    def test_async_views(self, settings, token):
+        settings.SERVER_TIMING_SAMPLE_RATE = 1
+        settings.SERVER_TIMING_HEADER = True
+        middleware = ServerTimingMiddleware(MeView.as_view())
+        request = AsyncRequestFactory().get(
+            "/", headers={"Authorization": f"Bearer {token['access']}"}
+        )
+
+        resp = async_to_sync(middleware)(request)
+
+        metrics = parse_header(resp["Server-Timing"])
+        assert resp.status_code == status.HTTP_200_OK
+        assert list(metrics) == ["db", "auth", "total"]
+        assert metrics["db"][1] != "0 queries"
+
+    def test_async_streaming_responses(self, settings, caplog):
+        settings.SERVER_TIMING_SAMPLE_RATE = 1
+
+        async def rows():
+            yield str(await sync_to_async(User.objects.count)())
+
+        async def view(request):
+            return StreamingHttpResponse(rows())
+
+        middleware = ServerTimingMiddleware(view)
+
+        async def get():
+            resp = await middleware(AsyncRequestFactory().get("/"))
+            return b"".join([chunk async for chunk in resp.streaming_content])
+
+        with caplog.at_level(logging.INFO, logger=TIMING_LOGGER):
+            body = async_to_sync(get)()
+
+        (record,) = caplog.records
+        assert body == b"0"
+        assert record.timing["queries"] == 1
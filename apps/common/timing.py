@@ -0,0 +1,107 @@
+"""
+Per-request timings for `ServerTimingMiddleware`.
+
+A sampled request gets a `RequestTimings` in a context variable. Database
+queries are counted and timed by `record_query`, an execute wrapper every
+connection gets when it is opened: connections are per thread, and the
+context variable also reaches the threads async views run queries in. Code
+wraps the phases it wants accounted in `phase(name)` (see
+`ServerTimingMixin`). Outside a sampled request both cost next to nothing.
+"""
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+_timings = ContextVar("request_timings", default=None)
+
+
+@dataclass
+class RequestTimings:
+    """Accumulated durations of the current request, in seconds"""
+
+    queries: int = 0
+    db: float = 0
+    phases: dict = field(default_factory=dict)
+
+    def add(self, name, duration):
+        self.phases[name] = self.phases.get(name, 0) + duration
+
+    def metrics(self, total) -> list:
+        """(name, milliseconds, description) of each measurement"""
+        metrics = [("db", self.db * 1000, f"{self.queries} queries")]
+        metrics += [
+            (name, duration * 1000, None) for name, duration in self.phases.items()
+        ]
+        metrics.append(("total", total * 1000, None))
+        return metrics
+
+    def header(self, total) -> str:
+        """Server-Timing header value"""
+        entries = []
+        for name, duration, description in self.metrics(total):
+            entry = f"{name};dur={duration:.1f}"
+            if description:
+                entry += f';desc="{description}"'
+            entries.append(entry)
+        return ", ".join(entries)
+
+
+def current():
+    return _timings.get()
+
+
+def record_query(execute, sql, params, many, context):
+    timings = _timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db += time.perf_counter() - start
+        timings.queries += 1
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """`connection_created` receiver adding `record_query` to the connection"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def recording(timings=None):
+    """Record into `timings`, a new `RequestTimings` by default"""
+    token = _timings.set(timings if timings is not None else RequestTimings())
+    try:
+        yield _timings.get()
+    finally:
+        _timings.reset(token)
+
+
+@contextmanager
+def phase(name):
+    """Add the time spent in the block to phase `name` of the current request"""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - start)
+
+
+def timed(name, func):
+    """`func` running in phase `name`"""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with phase(name):
+            return func(*args, **kwargs)
+
+    return wrapper
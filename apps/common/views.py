@@ -0,0 +1,325 @@
+import hashlib
+import json
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, Max
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views import View
+from rest_framework import exceptions
+
+from apps.common import routers, timing
+from apps.common.authentication import JWTAuthentication
+from apps.common.cache import serializer_version
+
+
+class StreamingListMixin:
+    """
+    Stream the `list` action when the negotiated renderer supports it
+    (see `apps.common.renderers.StreamingRenderer`).
+
+    Rows are serialized lazily while the response is written instead of
+    being collected into one list first. Without pagination the queryset is
+    read with `.iterator()`, so memory stays flat whatever the table size.
+    Other renderers fall back to the regular `list`.
+    """
+
+    stream_chunk_size = 2000
+
+    def list(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        if not hasattr(renderer, "render_stream"):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.get_serializer()
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            rows = self.iter_rows(serializer, page)
+            data = self.get_paginated_response(rows).data
+        else:
+            rows = queryset.iterator(chunk_size=self.stream_chunk_size)
+            data = self.iter_rows(serializer, rows)
+
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+
+        response = StreamingHttpResponse(content_type=content_type)
+        renderer_context = self.get_renderer_context()
+        renderer_context["response"] = response
+        response.streaming_content = renderer.render_stream(
+            data, request.accepted_media_type, renderer_context
+        )
+        return response
+
+    @staticmethod
+    def iter_rows(serializer, instances):
+        for instance in instances:
+            yield serializer.to_representation(instance)
+
+
+class FastReadMixin:
+    """
+    Serve `list` and `retrieve` from `values_list()` rows rendered by
+    `fast_read_serializer_class` (a `ValuesSerializer`), skipping model
+    instances entirely. Other actions use `serializer_class` as usual.
+    """
+
+    fast_read_serializer_class = None
+    fast_read_actions = ("list", "retrieve")
+
+    def use_fast_read(self) -> bool:
+        return (
+            self.fast_read_serializer_class is not None
+            and getattr(self, "action", None) in self.fast_read_actions
+        )
+
+    def get_serializer_class(self):
+        if self.use_fast_read():
+            return self.fast_read_serializer_class
+        return super().get_serializer_class()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.use_fast_read():
+            queryset = self.fast_read_serializer_class.values(
+                queryset, extra=self.get_fast_read_key_fields(queryset)
+            )
+        return queryset
+
+    def get_fast_read_key_fields(self, queryset):
+        """Columns read from the rows by ordering and pagination"""
+        ordering_fields = getattr(self, "ordering_fields", None)
+        if not isinstance(ordering_fields, (list, tuple)):
+            ordering_fields = []
+
+        ordering = [*queryset.model._meta.ordering, *ordering_fields]
+        return ["pk", *(field.lstrip("-") for field in ordering)]
+
+
+class ReplicaReadMixin:
+    """
+    Serve `replica_read_actions` from a read replica, unless the client is
+    pinned to the primary after a recent write (see `apps.common.routers`).
+    """
+
+    replica_read_actions = ("list", "retrieve")
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if getattr(self, "action", None) in self.replica_read_actions:
+            if alias := self.get_replica():
+                queryset = queryset.using(alias)
+        return queryset
+
+    def get_replica(self):
+        if not hasattr(self, "_replica"):
+            self._replica = routers.replica_for(self.request)
+        return self._replica
+
+
+class ServerTimingMixin:
+    """
+    Account authentication, serialization of the response data and rendering
+    as phases of requests sampled by `ServerTimingMiddleware`. Unsampled
+    requests run untouched.
+    """
+
+    def perform_authentication(self, request):
+        with timing.phase("auth"):
+            super().perform_authentication(request)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if timing.current() is not None:
+            serializer.to_representation = timing.timed(
+                "serialize", serializer.to_representation
+            )
+        return serializer
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        renderer = getattr(response, "accepted_renderer", None)
+        if renderer is not None and timing.current() is not None:
+            renderer.render = timing.timed("render", renderer.render)
+        return response
+
+
+class ConditionalGetMixin:
+    """
+    ETag and Last-Modified validators derived from `BaseModel.updated_at`,
+    checked before anything is serialized.
+
+    `retrieve` reads the object's `updated_at` alone and answers with a strong
+    ETag. `list` aggregates Max(updated_at) and Count over the filtered
+    queryset in one query and answers with a weak ETag, as a page can change
+    without moving either (an update older rows overtake, say). Matching
+    If-None-Match/If-Modified-Since get a 304.
+
+    `update` and `partial_update` lock the row and check If-Match and
+    If-Unmodified-Since against it, answering 412 to clients editing an
+    outdated copy.
+    """
+
+    conditional_field = "updated_at"
+    precondition_headers = ("If-Match", "If-Unmodified-Since")
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        state = queryset.aggregate(
+            last_modified=Max(self.conditional_field), count=Count("pk")
+        )
+        last_modified = state["last_modified"]
+        etag = self.make_etag(last_modified, state["count"], weak=True)
+
+        response = self.evaluate_preconditions(request, etag, last_modified)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        return self.set_validators(response, etag, last_modified)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_retrieve(super().retrieve, request, *args, **kwargs)
+
+    def conditional_retrieve(self, handler, request, *args, **kwargs):
+        """Run `handler` unless the client's copy of the object is current"""
+        last_modified = self.get_object_last_modified()
+        if last_modified is None:
+            return handler(request, *args, **kwargs)
+
+        etag = self.make_etag(last_modified)
+        response = self.evaluate_preconditions(request, etag, last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        return self.set_validators(response, etag, last_modified)
+
+    def update(self, request, *args, **kwargs):
+        if any(header in request.headers for header in self.precondition_headers):
+            last_modified = self.get_object_last_modified(lock=True)
+            if last_modified is not None:
+                etag = self.make_etag(last_modified)
+                response = self.evaluate_preconditions(request, etag, last_modified)
+                if response is not None:
+                    return response
+
+        self.updated_instance = None
+        response = super().update(request, *args, **kwargs)
+        if self.updated_instance is not None:
+            last_modified = getattr(self.updated_instance, self.conditional_field)
+            self.set_validators(response, self.make_etag(last_modified), last_modified)
+        return response
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        self.updated_instance = serializer.instance
+
+    def get_object_last_modified(self, lock=False):
+        """`conditional_field` of the requested object, None when there is none"""
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except (TypeError, ValueError, ValidationError):
+            return None
+
+        # Outside a transaction there is no lock to take
+        if lock and transaction.get_connection(queryset.db).in_atomic_block:
+            queryset = queryset.select_for_update()
+        return queryset.values_list(self.conditional_field, flat=True).first()
+
+    def make_etag(self, last_modified, count=1, weak=False) -> str:
+        # Representations vary with the serializer and the renderer
+        renderer = getattr(self.request, "accepted_renderer", None)
+        value = ":".join(
+            [
+                serializer_version(self.serializer_class),
+                getattr(renderer, "format", ""),
+                last_modified.isoformat() if last_modified else "",
+                str(count),
+            ]
+        )
+        etag = f'"{hashlib.md5(value.encode()).hexdigest()}"'
+        return f"W/{etag}" if weak else etag
+
+    @staticmethod
+    def evaluate_preconditions(request, etag, last_modified):
+        """A 304 or 412 response when the request's preconditions say so"""
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+    @staticmethod
+    def set_validators(response, etag, last_modified):
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            if last_modified:
+                response["Last-Modified"] = http_date(last_modified.timestamp())
+        return response
+
+
+class AsyncAPIView(View):
+    """
+    Async counterpart of the DRF `APIView` subset the auth endpoints need,
+    for serving them natively under ASGI with the async ORM.
+
+    Requests are JSON or form bodies exposed as `request.data`, users are
+    resolved by `JWTAuthentication.aauthenticate` and `APIException`s become
+    JSON error responses like DRF's. Views are CSRF exempt and opt out of
+    ATOMIC_REQUESTS, which Django refuses for async views.
+    """
+
+    authentication_class = JWTAuthentication
+    requires_authentication = False
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True
+        return transaction.non_atomic_requests(view)
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            request.data = self.parse(request)
+            with timing.phase("auth"):
+                await self.authenticate(request)
+            return await super().dispatch(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc)
+
+    def parse(self, request):
+        if request.method not in ("POST", "PUT", "PATCH"):
+            return {}
+        if request.content_type != "application/json":
+            return request.POST
+        try:
+            return json.loads(request.body or b"{}")
+        except ValueError as e:
+            raise exceptions.ParseError(f"JSON parse error - {e}")
+
+    async def authenticate(self, request):
+        authenticator = self.authentication_class()
+        result = await authenticator.aauthenticate(request)
+        if result is not None:
+            request.user, request.auth = result
+        elif self.requires_authentication:
+            raise exceptions.NotAuthenticated()
+        else:
+            request.user, request.auth = AnonymousUser(), None
+
+    def handle_exception(self, exc):
+        if isinstance(exc.detail, (list, dict)):
+            data = exc.detail
+        else:
+            data = {"detail": exc.detail}
+
+        response = JsonResponse(data, status=exc.status_code, safe=False)
+        if exc.status_code == 401:
+            response[
+                "WWW-Authenticate"
+            ] = self.authentication_class().authenticate_header(self.request)
+        return response
@@ -1,7 +1,8 @@
 import pytest
+from django.core.cache import cache
 from pytest_factoryboy import register
-from rest_framework_simplejwt.tokens import RefreshToken
 
+from apps.common.authentication import RefreshToken, user_cache
 from apps.common.utils import OTPUtils
 from apps.users.models import User
 from apps.users.tests.factories import UserFactory
@@ -14,6 +15,12 @@ def media_storage(settings, tmpdir):
     settings.MEDIA_ROOT = tmpdir.strpath
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    user_cache.clear()
+
+
 @pytest.fixture()
 def test_email():
     return "test@email.com"
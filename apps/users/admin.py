@@ -1,15 +1,21 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import PAGE_VAR
 from django.contrib.auth import admin as auth_admin
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
+from django.utils.translation import ngettext
 
+from apps.common.admin import ReplicaChangeListMixin
+from apps.common.pagination import EstimatedCountPaginator
+from apps.users.archive import restore_users
 from apps.users.forms import UserChangeForm, UserCreationForm
+from apps.users.models import ArchivedUser
 
 User = get_user_model()
 
 
 @admin.register(User)
-class UserAdmin(auth_admin.UserAdmin):
+class UserAdmin(ReplicaChangeListMixin, auth_admin.UserAdmin):
     form = UserChangeForm
     add_form = UserCreationForm
     fieldsets = (
@@ -48,5 +54,68 @@ class UserAdmin(auth_admin.UserAdmin):
 
     list_display = ["name", "email", "is_superuser"]
     list_display_links = ["name", "email"]
-    search_fields = ["name"]
+    # icontains on both, served by the pg_trgm indexes of migrations 0006/0008
+    search_fields = ["email", "name"]
+    # the unique email index provides this order
     ordering = ("email",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    # Widgets that load selected rows only, not every Group/Permission
+    filter_horizontal = ()
+    autocomplete_fields = ["groups"]
+    raw_id_fields = ["user_permissions"]
+    actions = ["activate_users", "deactivate_users", "soft_delete_users"]
+
+    def get_paginator(self, request, queryset, per_page, **kwargs):
+        try:
+            page_number = int(request.GET.get(PAGE_VAR, 1))
+        except ValueError:
+            page_number = 1
+        return self.paginator(queryset, per_page, page_number=page_number, **kwargs)
+
+    @admin.action(description=_("Activate selected users"), permissions=["change"])
+    def activate_users(self, request, queryset):
+        self.report_bulk_update(request, queryset.activate(), _("activated"))
+
+    @admin.action(description=_("Deactivate selected users"), permissions=["change"])
+    def deactivate_users(self, request, queryset):
+        self.report_bulk_update(request, queryset.deactivate(), _("deactivated"))
+
+    @admin.action(description=_("Soft delete selected users"), permissions=["delete"])
+    def soft_delete_users(self, request, queryset):
+        self.report_bulk_update(request, queryset.soft_delete(), _("deleted"))
+
+    def report_bulk_update(self, request, count, verb):
+        message = ngettext(
+            "%(count)d user %(verb)s.", "%(count)d users %(verb)s.", count
+        )
+        self.message_user(request, message % {"count": count, "verb": verb})
+
+
+@admin.register(ArchivedUser)
+class ArchivedUserAdmin(admin.ModelAdmin):
+    list_display = ["email", "user_id", "deleted_at", "archived_at"]
+    search_fields = ["email", "user_id"]
+    readonly_fields = ["user_id", "email", "data", "deleted_at", "archived_at"]
+    actions = ["restore"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def has_restore_permission(self, request):
+        return request.user.has_perm("users.add_user")
+
+    @admin.action(description=_("Restore selected users"), permissions=["restore"])
+    def restore(self, request, queryset):
+        user_ids = list(queryset.values_list("user_id", flat=True))
+        restored, skipped = restore_users(user_ids)
+        message = _("%(restored)d restored, %(skipped)d skipped.")
+        self.message_user(
+            request, message % {"restored": len(restored), "skipped": len(skipped)}
+        )
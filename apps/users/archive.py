@@ -0,0 +1,87 @@
+"""
+Archival of soft deleted users.
+
+Users soft deleted more than `USER_ARCHIVE_AFTER_DAYS` ago (`soft_delete()`
+stamps `updated_at`) are copied to `ArchivedUser` and deleted from
+`users_user`, `batch_size` at a time with one transaction per batch, so the
+hot table and its indexes only grow with live users. Archived rows are never
+changed: restoring a user copies the latest archived row back under the
+original id and leaves the archive as it was.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import serializers
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from apps.users.models import ArchivedUser, User
+
+
+def archive_deleted_users(days=None, batch_size=1000) -> int:
+    """Archive users deleted more than `days` ago, returns how many were moved"""
+    if days is None:
+        days = settings.USER_ARCHIVE_AFTER_DAYS
+    cutoff = timezone.now() - timedelta(days=days)
+    queryset = (
+        User.all_objects.filter(deleted=True, updated_at__lt=cutoff)
+        .prefetch_related("groups", "user_permissions")
+        .order_by("pk")
+    )
+
+    archived = 0
+    while True:
+        with transaction.atomic():
+            users = list(queryset.select_for_update(skip_locked=True)[:batch_size])
+            if not users:
+                return archived
+            archive_users(users)
+        archived += len(users)
+
+
+def archive_users(users):
+    records = serializers.serialize("python", users)
+    ArchivedUser.objects.bulk_create(
+        ArchivedUser(
+            user_id=user.pk, email=user.email, data=record, deleted_at=user.updated_at
+        )
+        for user, record in zip(users, records)
+    )
+    # Through the collector, so cascades and post_delete cache invalidation run
+    User.all_objects.filter(pk__in=[user.pk for user in users]).delete()
+
+
+def restore_users(user_ids):
+    """
+    Recreate archived users as live users under their original ids.
+
+    Returns the restored ids and the ids that could not be restored: unknown,
+    already back in `users_user`, or whose email was taken in the meantime.
+    """
+    restored, skipped = [], []
+    latest = {}
+    for archived in ArchivedUser.objects.filter(user_id__in=user_ids):
+        latest.setdefault(str(archived.user_id), archived)
+
+    existing = {
+        str(pk)
+        for pk in User.all_objects.filter(pk__in=user_ids).values_list("pk", flat=True)
+    }
+    for user_id in map(str, user_ids):
+        archived = latest.get(user_id)
+        if archived is None or user_id in existing:
+            skipped.append(user_id)
+            continue
+
+        (record,) = serializers.deserialize("python", [archived.data])
+        record.object.deleted = False
+        record.object.is_active = True
+        record.object.updated_at = timezone.now()
+        try:
+            with transaction.atomic():
+                record.save()
+        except IntegrityError:
+            skipped.append(user_id)
+        else:
+            restored.append(user_id)
+    return restored, skipped
@@ -0,0 +1,70 @@
+"""
+Async versions of the auth endpoints in apps.users.views, served by
+apps.users.urls when `settings.ASYNC_AUTH_VIEWS` is on. They are meant for
+the ASGI application (config/asgi.py); under WSGI every request would pay
+for an event loop instead.
+"""
+from django.http import JsonResponse
+from rest_framework import status
+
+from apps.common.views import AsyncAPIView
+
+from .serializers import (
+    AsyncSignUpSerializer,
+    ChangePasswordSerializer,
+    ForgotPasswordSerializer,
+    ResetPasswordSerializer,
+    SignupResponseSerializer,
+    UserSerializer,
+)
+
+
+class SignUpView(AsyncAPIView):
+    async def post(self, request):
+        serializer = AsyncSignUpSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = await serializer.acreate(serializer.validated_data)
+
+        response_serializer = SignupResponseSerializer(user)
+        return JsonResponse(response_serializer.data, status=status.HTTP_201_CREATED)
+
+
+class ForgotPasswordView(AsyncAPIView):
+    async def post(self, request):
+        serializer = ForgotPasswordSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = await serializer.acreate(serializer.validated_data)
+
+        return JsonResponse(data, status=status.HTTP_200_OK)
+
+
+class ResetPasswordView(AsyncAPIView):
+    async def post(self, request):
+        serializer = ResetPasswordSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        await serializer.acreate(serializer.validated_data)
+
+        return JsonResponse(
+            {"message": "Password set succesfully"}, status=status.HTTP_200_OK
+        )
+
+
+class ChangePasswordView(AsyncAPIView):
+    requires_authentication = True
+
+    async def post(self, request):
+        serializer = ChangePasswordSerializer(
+            data=request.data, context={"request": request}
+        )
+        serializer.is_valid(raise_exception=True)
+        data = await serializer.acreate(serializer.validated_data)
+
+        return JsonResponse(data, status=status.HTTP_201_CREATED)
+
+
+class MeView(AsyncAPIView):
+    requires_authentication = True
+
+    async def get(self, request):
+        serializer = UserSerializer(request.user, context={"request": request})
+        return JsonResponse(serializer.data, status=status.HTTP_200_OK)
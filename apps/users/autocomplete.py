@@ -0,0 +1,65 @@
+"""
+Prefix lookups of live users for pickers, see `UserView.autocomplete`.
+
+Email and name prefixes are matched as `LOWER(column) COLLATE "C" LIKE
+'prefix%'` and ordered by the same expression, which the indexes of migration
+0007 serve on PostgreSQL as a bounded index range scan: the top `limit` rows
+are read in order, with no sort and no count. The "C" collation is what lets
+one btree answer both the LIKE and the ORDER BY; other databases compare
+bytes already and use `LOWER(column)` as is. Results are kept in a
+per-process LRU cache, as short prefixes are requested over and over.
+"""
+from django.conf import settings
+from django.db import connections
+from django.db.models.functions import Collate, Lower
+
+from apps.common.cache import LRUCache
+from apps.users.models import User
+
+FIELDS = ("id", "name", "email")
+
+autocomplete_cache = LRUCache(
+    settings.USER_AUTOCOMPLETE_CACHE_SIZE, settings.USER_AUTOCOMPLETE_CACHE_TTL
+)
+
+
+def autocomplete_users(prefix: str, limit: int, using=None) -> list:
+    """Up to `limit` users whose email or name starts with `prefix`, emails first"""
+    prefix = prefix.strip().lower()
+    if not prefix:
+        return []
+
+    key = f"{limit}:{prefix}"
+    results = autocomplete_cache.get(key)
+    if results is None:
+        results = search(prefix, limit, using)
+        autocomplete_cache.set(key, results)
+    return results
+
+
+def search(prefix, limit, using=None):
+    queryset = User.objects.using(using) if using else User.objects.all()
+    results = {}
+    # One ordered range scan per index rather than an OR both would have to sort
+    for field in ("email", "name"):
+        if len(results) >= limit:
+            break
+        for row in prefix_matches(queryset, field, prefix, limit):
+            results.setdefault(row[0], dict(zip(FIELDS, row)))
+
+    return [
+        {**result, "id": str(result["id"])} for result in list(results.values())[:limit]
+    ]
+
+
+def prefix_matches(queryset, field, prefix, limit):
+    """First `limit` rows whose lowercased `field` starts with `prefix`"""
+    prefix_key = Lower(field)
+    if connections[queryset.db].vendor == "postgresql":
+        prefix_key = Collate(prefix_key, "C")
+    return (
+        queryset.annotate(prefix_key=prefix_key)
+        .filter(prefix_key__startswith=prefix)
+        .order_by("prefix_key")
+        .values_list(*FIELDS)[:limit]
+    )
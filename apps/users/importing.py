@@ -0,0 +1,182 @@
+"""
+Bulk user import for `manage.py import_users`.
+
+Rows are streamed from a CSV (header `email,name,password`) or NDJSON file and
+handled `chunk_size` at a time, so memory stays flat whatever the file size:
+
+1. rows are validated with `ImportUserSerializer`, the signup rules;
+2. emails already taken, or repeated within the chunk, are rejected with one
+   query per chunk;
+3. passwords are hashed on a process pool, as PBKDF2 is CPU bound;
+4. users are inserted with `bulk_create`, one transaction per chunk.
+"""
+import csv
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from apps.users.models import User
+from apps.users.serializers import ImportUserSerializer
+
+FORMATS = ("csv", "ndjson")
+
+
+@dataclass
+class ImportResult:
+    read: int = 0
+    imported: int = 0
+    rejected: int = 0
+    # Valid rows a concurrent insert beat, dropped by ignore_conflicts
+    conflicts: int = 0
+
+
+@dataclass
+class UnparsableRow:
+    """Yielded by `read_rows` in place of a line it cannot parse"""
+
+    line: int
+    text: str
+    error: str
+
+
+def read_rows(path, file_format=None):
+    """
+    Yield the rows of `path` as dicts, without loading the file. Malformed
+    NDJSON lines come as `UnparsableRow`s, for `import_users` to reject.
+    """
+    file_format = file_format or os.path.splitext(path)[1].lstrip(".").lower()
+    if file_format == "jsonl":
+        file_format = "ndjson"
+    if file_format not in FORMATS:
+        raise ValueError(f"Unsupported format {file_format!r}, use one of {FORMATS}")
+
+    with open(path, newline="", encoding="utf-8") as file:
+        if file_format == "csv":
+            yield from csv.DictReader(file)
+            return
+        for number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                yield UnparsableRow(number, line.rstrip("\n"), e.msg)
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def setup_worker(settings_module):
+    # Spawned workers start without Django, forked ones already have it
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    django.setup()
+
+
+def hash_password(raw_password):
+    return make_password(raw_password)
+
+
+def import_users(
+    rows,
+    chunk_size=1000,
+    batch_size=1000,
+    workers=None,
+    ignore_conflicts=True,
+    on_reject=None,
+    result=None,
+):
+    """
+    Import `rows` (dicts with email, name and password), returns an
+    `ImportResult`. `on_reject(number, row, errors)` is called for every
+    rejected row, numbered from 1. `workers=0` hashes in this process.
+    Pass `result` to keep the counts of chunks committed before an error.
+    """
+    if workers is None:
+        workers = os.cpu_count()
+    executor = None
+    if workers:
+        executor = ProcessPoolExecutor(
+            workers, initializer=setup_worker, initargs=(settings.SETTINGS_MODULE,)
+        )
+
+    if result is None:
+        result = ImportResult()
+    try:
+        for chunk in chunked(rows, chunk_size):
+            valid = validate_chunk(chunk, result, on_reject)
+            result.read += len(chunk)
+            if valid:
+                insert_chunk(valid, executor, batch_size, ignore_conflicts, result)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return result
+
+
+def validate_chunk(chunk, result, on_reject):
+    """Validated data of the chunk's valid rows, the others are rejected"""
+
+    def reject(line, row, errors):
+        result.rejected += 1
+        if on_reject:
+            on_reject(line, row, errors)
+
+    candidates = {}
+    for line, row in enumerate(chunk, start=result.read + 1):
+        if isinstance(row, UnparsableRow):
+            error = f"invalid JSON on line {row.line}: {row.error}"
+            reject(line, row.text, {"non_field_errors": [error]})
+            continue
+
+        serializer = ImportUserSerializer(data=row)
+        if not serializer.is_valid():
+            reject(line, row, serializer.errors)
+            continue
+
+        data = serializer.validated_data
+        data["email"] = User.objects.normalize_email(data["email"])
+        if data["email"] in candidates:
+            reject(line, row, {"email": ["duplicate email in file"]})
+            continue
+        candidates[data["email"]] = (line, row, data)
+
+    # Soft deleted users keep their email
+    taken = set(
+        User.all_objects.filter(email__in=candidates).values_list("email", flat=True)
+    )
+    valid = []
+    for email, (line, row, data) in candidates.items():
+        if email in taken:
+            reject(line, row, {"email": ["user with this email already exists."]})
+        else:
+            valid.append(data)
+    return valid
+
+
+def insert_chunk(valid, executor, batch_size, ignore_conflicts, result):
+    passwords = [data.pop("password") for data in valid]
+    if executor is None:
+        hashes = map(hash_password, passwords)
+    else:
+        hashes = executor.map(hash_password, passwords, chunksize=64)
+
+    users = [User(password=hashed, **data) for data, hashed in zip(valid, hashes)]
+    with transaction.atomic():
+        User.objects.bulk_create(
+            users, batch_size=batch_size, ignore_conflicts=ignore_conflicts
+        )
+        # ids are generated here, so the ones found are the rows inserted
+        inserted = User.all_objects.filter(pk__in=[user.pk for user in users]).count()
+
+    result.imported += inserted
+    result.conflicts += len(users) - inserted
@@ -0,0 +1,111 @@
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
+from django.db import DatabaseError, close_old_connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginBuffer:
+    """
+    Collects last_login timestamps in memory and writes them with one
+    `bulk_update` per flush instead of an UPDATE inside every login request.
+
+    A daemon thread flushes every `interval` seconds, or as soon as
+    `max_size` users are pending. Pending timestamps are flushed at exit, so
+    a graceful worker shutdown loses nothing; a killed worker loses at most
+    one interval of logins.
+    """
+
+    def __init__(self, interval: float = 5, max_size: int = 500, batch_size: int = 500):
+        self.interval = interval
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        return len(self._pending)
+
+    def record(self, user, timestamp=None):
+        timestamp = timestamp or timezone.now()
+        with self._lock:
+            previous = self._pending.get(user.pk)
+            if previous is None or previous < timestamp:
+                self._pending[user.pk] = timestamp
+            full = len(self._pending) >= self.max_size
+
+        self.start()
+        if full:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """Write the pending timestamps, returns the number of users updated"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        if not pending:
+            return 0
+
+        User = get_user_model()
+        users = [
+            User(pk=pk, last_login=last_login) for pk, last_login in pending.items()
+        ]
+        try:
+            User.objects.bulk_update(users, ["last_login"], batch_size=self.batch_size)
+        except DatabaseError:
+            logger.exception("Failed to write %s last_login timestamps", len(users))
+            self._restore(pending)
+            return 0
+        return len(users)
+
+    def start(self):
+        if self._thread is not None:
+            return
+
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="last-login-flush", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+            close_old_connections()
+
+    def _restore(self, pending):
+        with self._lock:
+            for pk, last_login in pending.items():
+                newer = self._pending.get(pk)
+                if newer is None or newer < last_login:
+                    self._pending[pk] = last_login
+
+
+buffer = LastLoginBuffer(
+    interval=settings.LAST_LOGIN_FLUSH_INTERVAL,
+    max_size=settings.LAST_LOGIN_FLUSH_SIZE,
+)
+
+
+def record_login(user):
+    """
+    Record a login for `user`, buffered unless `settings.LAST_LOGIN_BUFFERED`
+    is off, in which case last_login is written right away like Django does.
+    """
+    if settings.LAST_LOGIN_BUFFERED:
+        user.last_login = timezone.now()
+        buffer.record(user, user.last_login)
+    else:
+        update_last_login(None, user)
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.users.archive import archive_deleted_users
+
+
+class Command(BaseCommand):
+    help = "Move users soft deleted more than --days ago to the ArchivedUser table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=settings.USER_ARCHIVE_AFTER_DAYS
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        archived = archive_deleted_users(options["days"], options["batch_size"])
+        self.stdout.write(f"Archived {archived} users")
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.exporting import ENCODERS, export_users, filter_users
+from apps.users.models import User
+from apps.users.views import UserView
+
+
+class Command(BaseCommand):
+    help = "Export live users as CSV or NDJSON, filtered like the users endpoint"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", "-o", help="File to write, default stdout")
+        parser.add_argument("--format", choices=list(ENCODERS), default="csv")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument(
+            "--filter",
+            action="append",
+            default=[],
+            metavar="FIELD=VALUE",
+            help=f"Repeatable, on {', '.join(UserView.filterset_fields)}",
+        )
+
+    def handle(self, *args, **options):
+        params = {}
+        for option in options["filter"]:
+            name, sep, value = option.partition("=")
+            if not sep or name not in UserView.filterset_fields:
+                raise CommandError(f"Unknown filter {option!r}")
+            params[name] = value
+
+        queryset, errors = filter_users(
+            User.objects.all(), params, UserView.filterset_fields
+        )
+        if errors:
+            raise CommandError(errors.as_text())
+
+        chunks = export_users(queryset, options["format"], options["chunk_size"])
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as file:
+                file.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
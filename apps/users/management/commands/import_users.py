@@ -0,0 +1,90 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from apps.users.importing import FORMATS, ImportResult, import_users, read_rows
+
+
+class Command(BaseCommand):
+    help = "Import users from a CSV (email,name,password) or NDJSON file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format", choices=FORMATS, help="Default: the file extension"
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Password hashing processes, 0 hashes in this process. Default: CPU count",
+        )
+        parser.add_argument(
+            "--no-ignore-conflicts",
+            dest="ignore_conflicts",
+            action="store_false",
+            help="Fail on rows whose email was inserted concurrently instead of "
+            "skipping them",
+        )
+        parser.add_argument(
+            "--rejects",
+            help="Write rejected rows with their errors to this NDJSON file",
+        )
+        parser.add_argument(
+            "--show-rejects",
+            type=int,
+            default=20,
+            help="Rejected rows printed, at most",
+        )
+
+    def handle(self, *args, **options):
+        rejects_file = None
+        if options["rejects"]:
+            rejects_file = open(options["rejects"], "w", encoding="utf-8")
+        shown = 0
+
+        def on_reject(line, row, errors):
+            nonlocal shown
+            if isinstance(row, dict):
+                row = {key: value for key, value in row.items() if key != "password"}
+            if rejects_file:
+                rejects_file.write(
+                    json.dumps({"row_number": line, "row": row, "errors": errors})
+                    + "\n"
+                )
+            if shown < options["show_rejects"]:
+                shown += 1
+                self.stdout.write(self.style.WARNING(f"Row {line} rejected: {errors}"))
+
+        start = time.perf_counter()
+        result = ImportResult()
+        try:
+            import_users(
+                read_rows(options["path"], options["format"]),
+                chunk_size=options["chunk_size"],
+                batch_size=options["batch_size"],
+                workers=options["workers"],
+                ignore_conflicts=options["ignore_conflicts"],
+                on_reject=on_reject,
+                result=result,
+            )
+        except (OSError, ValueError) as e:
+            raise CommandError(e)
+        except IntegrityError as e:
+            raise CommandError(
+                f"Conflicting insert, stopped after {result.imported} users were "
+                f"imported: {e}"
+            )
+        finally:
+            if rejects_file:
+                rejects_file.close()
+        elapsed = max(time.perf_counter() - start, 0.001)
+
+        self.stdout.write(
+            f"Read {result.read} rows in {elapsed:.1f}s ({result.read / elapsed:.0f} rows/s): "
+            f"{result.imported} imported, {result.rejected} rejected, "
+            f"{result.conflicts} conflicts"
+        )
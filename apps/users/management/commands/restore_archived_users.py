@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from apps.users.archive import restore_users
+
+
+class Command(BaseCommand):
+    help = "Restore archived users under their original ids"
+
+    def add_arguments(self, parser):
+        parser.add_argument("user_ids", nargs="+")
+
+    def handle(self, *args, **options):
+        restored, skipped = restore_users(options["user_ids"])
+        self.stdout.write(f"Restored {len(restored)} users")
+        for user_id in skipped:
+            self.stdout.write(self.style.WARNING(f"Skipped {user_id}"))
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-16 23:37
+
+import apps.common.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_user_users_created_at_id_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='id',
+            field=models.UUIDField(default=apps.common.ids.generate_id, editable=False, primary_key=True, serialize=False, unique=True),
+        ),
+    ]
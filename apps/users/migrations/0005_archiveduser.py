@@ -0,0 +1,28 @@
+# Generated by Django 5.1.4 on 2026-10-16 23:42
+
+import apps.users.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_live_user_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedUser',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_id', models.UUIDField(db_index=True)),
+                ('email', models.EmailField(db_index=True, max_length=255)),
+                ('data', models.JSONField(encoder=apps.users.models.ArchiveJSONEncoder)),
+                ('deleted_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ('-archived_at',),
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+# PostgreSQL only, other databases keep searching with plain LIKE scans
+FORWARD_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    # Matches Django's icontains, UPPER("email"::text) LIKE UPPER(%s)
+    "CREATE INDEX users_email_trgm_idx ON users_user USING gin (UPPER(email) gin_trgm_ops)",
+    """
+    ALTER TABLE users_user ADD COLUMN name_search tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple', coalesce(name, ''))) STORED
+    """,
+    "CREATE INDEX users_name_search_idx ON users_user USING gin (name_search)",
+]
+
+REVERSE_SQL = [
+    "DROP INDEX IF EXISTS users_email_trgm_idx",
+    "ALTER TABLE users_user DROP COLUMN IF EXISTS name_search",
+]
+
+
+def run_sql(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0005_archiveduser"),
+    ]
+
+    operations = [
+        migrations.RunPython(run_sql(FORWARD_SQL), run_sql(REVERSE_SQL)),
+    ]
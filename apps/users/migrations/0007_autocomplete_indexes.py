@@ -0,0 +1,41 @@
+from django.db import migrations
+
+# PostgreSQL only. Under COLLATE "C" the default btree opclass serves both the
+# LIKE 'prefix%' and the ORDER BY of apps.users.autocomplete's lookups, which
+# filter and order on the same LOWER(column) COLLATE "C" expression.
+FORWARD_SQL = [
+    """
+    CREATE INDEX users_email_prefix_idx ON users_user ((LOWER(email) COLLATE "C"))
+    WHERE deleted = false
+    """,
+    """
+    CREATE INDEX users_name_prefix_idx ON users_user ((LOWER(name) COLLATE "C"))
+    WHERE deleted = false
+    """,
+]
+
+REVERSE_SQL = [
+    "DROP INDEX IF EXISTS users_email_prefix_idx",
+    "DROP INDEX IF EXISTS users_name_prefix_idx",
+]
+
+
+def run_sql(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0006_search_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(run_sql(FORWARD_SQL), run_sql(REVERSE_SQL)),
+    ]
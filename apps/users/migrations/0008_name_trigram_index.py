@@ -0,0 +1,32 @@
+from django.db import migrations
+
+# PostgreSQL only, serves the admin's name__icontains search like
+# users_email_trgm_idx does for email
+FORWARD_SQL = [
+    "CREATE INDEX users_name_trgm_idx ON users_user USING gin (UPPER(name) gin_trgm_ops)",
+]
+
+REVERSE_SQL = [
+    "DROP INDEX IF EXISTS users_name_trgm_idx",
+]
+
+
+def run_sql(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0007_autocomplete_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(run_sql(FORWARD_SQL), run_sql(REVERSE_SQL)),
+    ]
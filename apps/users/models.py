@@ -1,15 +1,20 @@
+import datetime
+
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
     PermissionsMixin,
 )
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
+from apps.common import hashers
 from apps.common import models as base_models
 
 
-class UserManager(BaseUserManager):
+class UserManager(BaseUserManager.from_queryset(base_models.BaseQuerySet)):
     def create_user(self, email, password=None, **extra_fields):
         """
         Create and save a user with given email and password
@@ -23,6 +28,16 @@ class UserManager(BaseUserManager):
 
         return user
 
+    async def acreate_user(self, email, password=None, **extra_fields):
+        if not email:
+            raise ValueError(_("The email must be set"))
+        email = self.normalize_email(email)
+        user = self.model(email=email, **extra_fields)
+        await user.aset_password(password)
+        await user.asave(using=self._db)
+
+        return user
+
     def create_superuser(self, email, password, **extra_fields):
         user = self.create_user(email, password, **extra_fields)
         user.is_staff = True
@@ -32,6 +47,16 @@ class UserManager(BaseUserManager):
         return user
 
 
+class LiveUserManager(UserManager):
+    """Users that are not soft deleted"""
+
+    # Partial index on exactly these rows, for pagination estimates
+    estimate_index = "users_live_email_idx"
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted=False)
+
+
 class User(PermissionsMixin, base_models.BaseModel, AbstractBaseUser):
     """Default user for api_project."""
 
@@ -51,15 +76,61 @@ class User(PermissionsMixin, base_models.BaseModel, AbstractBaseUser):
     # role = models.CharField(max_length=25, choices=Roles.choices, default=Roles.USER)
     deleted = models.BooleanField(default=False)
 
-    objects = UserManager()
+    objects = LiveUserManager()
+    # Deleted users included, for the admin, uniqueness checks and auth backends
+    all_objects = UserManager()
 
     class Meta:
         ordering = ("created_at",)
+        default_manager_name = "all_objects"
+        indexes = [
+            # Back keyset pagination of live users on the orderings UserView
+            # allows. The created_at one covers the listed columns so pages
+            # are read from the index alone.
+            models.Index(
+                fields=["created_at", "id", "email", "name"],
+                condition=Q(deleted=False),
+                name="users_live_created_at_idx",
+            ),
+            models.Index(
+                fields=["email", "id"],
+                condition=Q(deleted=False),
+                name="users_live_email_idx",
+            ),
+        ]
 
     USERNAME_FIELD = "email"
     EMAIL_FIELD = "email"
     REQUIRED_FIELDS = ["name"]
 
+    def set_password(self, raw_password):
+        self.password = hashers.make_password(raw_password)
+        self._password = raw_password
+
+    async def aset_password(self, raw_password):
+        self.password = await hashers.amake_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        """
+        Check the password on the hashing pool, saving a new hash when it was
+        made with outdated hasher parameters
+        """
+        is_correct, rehashed = hashers.check_password(raw_password, self.password)
+        if rehashed:
+            self.password = rehashed
+            self.save(update_fields=["password"])
+        return is_correct
+
+    async def acheck_password(self, raw_password):
+        is_correct, rehashed = await hashers.acheck_password(
+            raw_password, self.password
+        )
+        if rehashed:
+            self.password = rehashed
+            await self.asave(update_fields=["password"])
+        return is_correct
+
     def get_full_name(self):
         return self.name
 
@@ -68,3 +139,33 @@ class User(PermissionsMixin, base_models.BaseModel, AbstractBaseUser):
 
     def __str__(self) -> str:
         return self.get_full_name() or self.email
+
+
+class ArchiveJSONEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder keeping microseconds, which it cuts to milliseconds"""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class ArchivedUser(models.Model):
+    """
+    Append-only copy of a soft deleted user moved out of `users_user` by
+    `apps.users.archive`. `data` holds the row as Django's python serializer
+    renders it, many-to-many ids included, so restoring recreates the user
+    with its original id.
+    """
+
+    user_id = models.UUIDField(db_index=True)
+    email = models.EmailField(max_length=255, db_index=True)
+    data = models.JSONField(encoder=ArchiveJSONEncoder)
+    deleted_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ("-archived_at",)
+
+    def __str__(self) -> str:
+        return self.email
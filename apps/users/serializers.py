@@ -1,13 +1,20 @@
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError
 from drf_yasg.utils import swagger_serializer_method
 from rest_framework import serializers
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
 
-from apps.common.email import send_email
+from apps.common.authentication import RefreshToken, aget_model_user, get_model_user
+from apps.common.email import asend_email, send_email
+from apps.common.serializers import ValuesSerializer
 from apps.common.utils import OTPUtils
+from apps.users.last_login import record_login
 
 User = get_user_model()
 
+EMAIL_TAKEN = "user with this email already exists."
+
 
 class SignUpSerializer(serializers.ModelSerializer):
     """
@@ -33,6 +40,42 @@ class SignUpSerializer(serializers.ModelSerializer):
         return User.objects.create_user(**validated_data)
 
 
+class AsyncSignUpSerializer(SignUpSerializer):
+    """
+    SignUpSerializer for async views, the unique email check runs on the
+    async ORM in `acreate` instead of in a validator
+    """
+
+    class Meta(SignUpSerializer.Meta):
+        extra_kwargs = {"email": {"validators": []}}
+
+    async def acreate(self, validated_data: dict):
+        _ = validated_data.pop("password2")
+        email = User.objects.normalize_email(validated_data["email"])
+        # Soft deleted users keep their email
+        if await User.all_objects.filter(email=email).aexists():
+            raise serializers.ValidationError({"email": [EMAIL_TAKEN]})
+
+        try:
+            return await User.objects.acreate_user(**validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError({"email": [EMAIL_TAKEN]})
+
+
+class ImportUserSerializer(SignUpSerializer):
+    """
+    SignUpSerializer rules for rows of `manage.py import_users`: there is no
+    password confirmation and emails are checked for uniqueness per chunk
+    by apps.users.importing instead of one query per row
+    """
+
+    password2 = None
+
+    class Meta(SignUpSerializer.Meta):
+        fields = ["email", "name", "password"]
+        extra_kwargs = {"email": {"validators": []}}
+
+
 class SignupResponseSerializer(serializers.ModelSerializer):
     token = serializers.SerializerMethodField()
 
@@ -48,12 +91,51 @@ class SignupResponseSerializer(serializers.ModelSerializer):
         return {"refresh": str(refresh), "access": str(refresh.access_token)}
 
 
+class TokenObtainPairSerializer(jwt_serializers.TokenObtainPairSerializer):
+    """
+    login serializer issuing tokens with the user claims and recording
+    last_login through apps.users.last_login
+    """
+
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        record_login(self.user)
+        return data
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    """
+    refresh serializer refusing tokens of users that were deleted, which
+    `User.objects` no longer finds
+    """
+
+    def validate(self, attrs):
+        try:
+            return super().validate(attrs)
+        except User.DoesNotExist:
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
+
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["email", "name", "id"]
 
 
+class UserReadSerializer(ValuesSerializer):
+    """
+    read-only UserSerializer working on values_list rows
+    """
+
+    class Meta(ValuesSerializer.Meta):
+        model = User
+        fields = UserSerializer.Meta.fields
+
+
 class ForgotPasswordSerializer(serializers.Serializer):
     """
     serializer for initiating forgot password. Send reset code
@@ -75,6 +157,15 @@ class ForgotPasswordSerializer(serializers.Serializer):
 
         return {"token": token}
 
+    async def acreate(self, validated_data: dict):
+        token = ""
+        email = validated_data.get("email")
+        if user := await User.objects.filter(email=email).afirst():
+            code, token = OTPUtils.generate_otp(user)
+            await asend_email(email, "Password Reset", code)
+
+        return {"token": token}
+
 
 class ResetPasswordSerializer(serializers.Serializer):
     """ """
@@ -112,6 +203,25 @@ class ResetPasswordSerializer(serializers.Serializer):
             "email": user.email,
         }
 
+    async def acreate(self, validated_data):
+        data = OTPUtils.decode_token(validated_data.get("token"))
+
+        if not data or not isinstance(data, dict):
+            raise serializers.ValidationError("Invalid token")
+
+        if not (user := await User.objects.filter(id=data.get("user_id")).afirst()):
+            raise serializers.ValidationError("User does not exist")
+
+        if not OTPUtils.verify_otp(validated_data.get("code"), data["secret"]):
+            raise serializers.ValidationError("Invalid code")
+
+        await user.aset_password(validated_data.get("password"))
+        await user.asave()
+
+        return {
+            "email": user.email,
+        }
+
 
 class ChangePasswordSerializer(serializers.Serializer):
     old_password = serializers.CharField(min_length=6, required=True)
@@ -122,7 +232,7 @@ class ChangePasswordSerializer(serializers.Serializer):
 
     def create(self, validated_data):
         request = self.context.get("request")
-        user: User = request.user
+        user: User = get_model_user(request.user)
 
         if not user.check_password(validated_data.get("old_password")):
             raise serializers.ValidationError({"detail": "Incorrect password"})
@@ -132,3 +242,15 @@ class ChangePasswordSerializer(serializers.Serializer):
         user.save()
 
         return {"old_password": "", "new_password": ""}
+
+    async def acreate(self, validated_data):
+        request = self.context.get("request")
+        user: User = await aget_model_user(request.user)
+
+        if not await user.acheck_password(validated_data.get("old_password")):
+            raise serializers.ValidationError({"detail": "Incorrect password"})
+
+        await user.aset_password(validated_data.get("new_password"))
+        await user.asave()
+
+        return {"old_password": "", "new_password": ""}
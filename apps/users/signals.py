@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.common.authentication import user_cache
+from apps.common.cache import serializer_cache_key
+from apps.common.signals import bulk_updated
+from apps.users.autocomplete import autocomplete_cache
+from apps.users.serializers import UserSerializer
+
+User = get_user_model()
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_caches(sender, instance, **kwargs):
+    user_cache.delete(str(instance.pk))
+    autocomplete_cache.clear()
+
+    # Again on commit, in case a request cached the old row in between
+    key = serializer_cache_key(UserSerializer, instance.pk)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+@receiver(bulk_updated, sender=User)
+def invalidate_bulk_user_caches(sender, pks, **kwargs):
+    for pk in pks:
+        user_cache.delete(str(pk))
+    autocomplete_cache.clear()
+
+    keys = [serializer_cache_key(UserSerializer, pk) for pk in pks]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,88 @@
+import pytest
+from django.contrib.admin.widgets import (
+    AutocompleteSelectMultiple,
+    ManyToManyRawIdWidget,
+)
+from django.urls.base import reverse
+
+from apps.common.pagination import EstimatedCountPaginator
+from apps.users.admin import UserAdmin
+from apps.users.models import User
+from apps.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestUserAdmin:
+    @pytest.fixture
+    def admin_client(self, client):
+        client.force_login(UserFactory(is_staff=True, is_superuser=True))
+        return client
+
+    def test_changelist_search(self, admin_client):
+        user = UserFactory(name="Findable Person")
+        UserFactory.create_batch(2)
+
+        resp = admin_client.get(
+            reverse("admin:users_user_changelist"), {"q": "findable"}
+        )
+
+        assert resp.status_code == 200
+        assert list(resp.context["cl"].result_list) == [user]
+
+    def test_changelist_pages_past_count_limit(self, admin_client, monkeypatch):
+        monkeypatch.setattr(EstimatedCountPaginator, "count_limit", 2)
+        monkeypatch.setattr(UserAdmin, "list_per_page", 1)
+        UserFactory.create_batch(7, name="findable")
+        url = reverse("admin:users_user_changelist")
+
+        resp = admin_client.get(url, {"q": "findable", "p": 4})
+
+        assert resp.status_code == 200
+        assert len(resp.context["cl"].result_list) == 1
+        assert "5+ users" in resp.content.decode()
+
+    def test_change_form_widgets(self, admin_client, user: User):
+        resp = admin_client.get(reverse("admin:users_user_change", args=(user.pk,)))
+
+        fields = resp.context["adminform"].form.fields
+        assert isinstance(fields["groups"].widget.widget, AutocompleteSelectMultiple)
+        assert isinstance(fields["user_permissions"].widget, ManyToManyRawIdWidget)
+
+
+class TestUserAdminActions:
+    @pytest.fixture
+    def admin_client(self, client):
+        client.force_login(UserFactory(is_staff=True, is_superuser=True))
+        return client
+
+    def run_action(self, client, action, users):
+        return client.post(
+            reverse("admin:users_user_changelist"),
+            {"action": action, "_selected_action": [user.pk for user in users]},
+            follow=True,
+        )
+
+    def test_deactivate_and_activate(self, admin_client):
+        users = UserFactory.create_batch(2)
+
+        resp = self.run_action(admin_client, "deactivate_users", users)
+        assert "2 users deactivated." in resp.content.decode()
+        assert (
+            User.objects.filter(pk__in=[u.pk for u in users], is_active=True).count()
+            == 0
+        )
+
+        self.run_action(admin_client, "activate_users", users[:1])
+        assert (
+            User.objects.filter(pk__in=[u.pk for u in users], is_active=True).count()
+            == 1
+        )
+
+    def test_soft_delete(self, admin_client):
+        user = UserFactory()
+
+        self.run_action(admin_client, "soft_delete_users", [user])
+
+        user.refresh_from_db()
+        assert user.deleted and not user.is_active
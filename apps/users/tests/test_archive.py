@@ -0,0 +1,71 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.users.archive import archive_deleted_users, restore_users
+from apps.users.models import ArchivedUser, User
+from apps.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def delete_user(days_ago, **kwargs):
+    user = UserFactory(**kwargs)
+    User.all_objects.filter(pk=user.pk).soft_delete()
+    User.all_objects.filter(pk=user.pk).update(
+        updated_at=timezone.now() - timedelta(days=days_ago)
+    )
+    return user
+
+
+class TestArchive:
+    def test_moves_old_deleted_users(self):
+        live = UserFactory()
+        recent = delete_user(days_ago=1)
+        old = [delete_user(days_ago=40) for _ in range(3)]
+
+        assert archive_deleted_users(days=30, batch_size=2) == 3
+
+        assert set(User.all_objects.all()) == {live, recent}
+        assert {a.user_id for a in ArchivedUser.objects.all()} == {u.pk for u in old}
+
+    def test_restore(self):
+        group = Group.objects.create(name="editors")
+        user = delete_user(days_ago=40)
+        user.groups.add(group)
+        archive_deleted_users(days=30)
+
+        restored, skipped = restore_users([user.pk])
+
+        assert restored == [str(user.pk)] and skipped == []
+        restored_user = User.objects.get(pk=user.pk)
+        assert restored_user.email == user.email
+        assert restored_user.password == user.password
+        assert restored_user.created_at == user.created_at
+        assert restored_user.is_active
+        assert list(restored_user.groups.all()) == [group]
+        # The archive is append-only
+        assert ArchivedUser.objects.filter(user_id=user.pk).exists()
+
+    def test_restore_skips_taken_email_and_live_users(self):
+        user = delete_user(days_ago=40)
+        archive_deleted_users(days=30)
+        UserFactory(email=user.email)
+        live = UserFactory()
+
+        restored, skipped = restore_users([user.pk, live.pk])
+
+        assert restored == []
+        assert skipped == [str(user.pk), str(live.pk)]
+
+    def test_commands(self, capsys):
+        user = delete_user(days_ago=40)
+
+        call_command("archive_deleted_users", "--days", "30")
+        call_command("restore_archived_users", str(user.pk))
+
+        assert capsys.readouterr().out == "Archived 1 users\nRestored 1 users\n"
+        assert User.objects.filter(pk=user.pk).exists()
@@ -0,0 +1,143 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core import mail
+from django.test import AsyncRequestFactory
+from rest_framework import status
+
+from apps.users import async_views
+from apps.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def call():
+    factory = AsyncRequestFactory()
+
+    def call_view(view_class, method="post", data=None, token=None):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        if method == "post":
+            request = factory.post(
+                "/", data=data or {}, content_type="application/json", headers=headers
+            )
+        else:
+            request = factory.get("/", headers=headers)
+
+        response = async_to_sync(view_class.as_view())(request)
+        return response.status_code, json.loads(response.content)
+
+    return call_view
+
+
+class TestAsyncAuthViews:
+    def test_views_skip_atomic_requests(self):
+        view = async_views.SignUpView.as_view()
+
+        assert view.csrf_exempt
+        assert view._non_atomic_requests == {"default"}
+
+    def test_signup(self, call, test_email, test_password):
+        data = {
+            "email": test_email,
+            "password": test_password,
+            "password2": test_password,
+        }
+
+        code, resp_data = call(async_views.SignUpView, data=data)
+
+        assert code == status.HTTP_201_CREATED
+        assert resp_data["email"] == test_email
+        assert {"access", "refresh"} <= resp_data["token"].keys()
+        assert User.objects.get(email=test_email).check_password(test_password)
+
+    def test_signup_existing_email(self, call, user, test_password):
+        data = {
+            "email": user.email,
+            "password": test_password,
+            "password2": test_password,
+        }
+
+        code, resp_data = call(async_views.SignUpView, data=data)
+
+        assert code == status.HTTP_400_BAD_REQUEST
+        assert "email" in resp_data
+
+    def test_signup_invalid(self, call, test_email):
+        data = {"email": test_email, "password": "password", "password2": "other"}
+
+        code, resp_data = call(async_views.SignUpView, data=data)
+
+        assert code == status.HTTP_400_BAD_REQUEST
+        assert "password2" in resp_data
+
+    def test_forget_password(self, call, user):
+        code, resp_data = call(
+            async_views.ForgotPasswordView, data={"email": user.email}
+        )
+
+        assert code == status.HTTP_200_OK
+        assert resp_data["token"]
+        assert len(mail.outbox) == 1
+
+    def test_reset_password(self, call, user, otp_code):
+        otp, token = otp_code
+        data = {"token": token, "code": otp, "password": "new_password"}
+
+        code, _ = call(async_views.ResetPasswordView, data=data)
+
+        assert code == status.HTTP_200_OK
+        user.refresh_from_db()
+        assert user.check_password("new_password")
+
+    def test_reset_password_wrong_code(self, call, otp_code):
+        _, token = otp_code
+        data = {"token": token, "code": "000000", "password": "new_password"}
+
+        code, resp_data = call(async_views.ResetPasswordView, data=data)
+
+        assert code == status.HTTP_400_BAD_REQUEST
+        assert resp_data == ["Invalid code"]
+
+    def test_change_password(self, call, user, token, test_password):
+        data = {"old_password": test_password, "new_password": "new_password"}
+
+        code, _ = call(async_views.ChangePasswordView, data=data, token=token["access"])
+
+        assert code == status.HTTP_201_CREATED
+        user.refresh_from_db()
+        assert user.check_password("new_password")
+
+    def test_change_password_deleted_claims_user(
+        self, settings, call, user, token, test_password
+    ):
+        settings.JWT_USER_RESOLUTION = "claims"
+        User.objects.filter(pk=user.pk).soft_delete()
+        data = {"old_password": test_password, "new_password": "new_password"}
+
+        code, _ = call(async_views.ChangePasswordView, data=data, token=token["access"])
+
+        assert code == status.HTTP_401_UNAUTHORIZED
+
+    def test_change_password_requires_authentication(self, call, test_password):
+        data = {"old_password": test_password, "new_password": "new_password"}
+
+        code, resp_data = call(async_views.ChangePasswordView, data=data)
+
+        assert code == status.HTTP_401_UNAUTHORIZED
+        assert "detail" in resp_data
+
+    @pytest.mark.parametrize("resolution", ["db", "cache", "claims"])
+    def test_me(self, settings, call, user, token, resolution):
+        settings.JWT_USER_RESOLUTION = resolution
+
+        code, resp_data = call(async_views.MeView, method="get", token=token["access"])
+
+        assert code == status.HTTP_200_OK
+        assert resp_data == {"email": user.email, "name": user.name, "id": str(user.id)}
+
+    def test_me_invalid_token(self, call):
+        code, _ = call(async_views.MeView, method="get", token="invalid")
+
+        assert code == status.HTTP_401_UNAUTHORIZED
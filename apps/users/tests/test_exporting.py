@@ -0,0 +1,50 @@
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from apps.users.exporting import BUFFER_SIZE, export_users
+from apps.users.models import User
+from apps.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestExportUsers:
+    def test_chunks_are_buffered(self):
+        UserFactory.create_batch(3)
+
+        chunks = list(export_users(User.objects.all(), "csv", chunk_size=1))
+
+        assert len(chunks) == 1
+        assert chunks[0].count("\r\n") == 4
+
+    def test_large_exports_stream_in_chunks(self):
+        UserFactory.create_batch(3, name="x" * (BUFFER_SIZE // 2))
+
+        chunks = list(export_users(User.objects.all(), "ndjson"))
+
+        assert len(chunks) == 2
+        assert sum(chunk.count("\n") for chunk in chunks) == 3
+
+    def test_command_writes_file(self, tmp_path):
+        UserFactory(is_active=True)
+        inactive = UserFactory(is_active=False)
+        output = tmp_path / "users.ndjson"
+
+        call_command(
+            "export_users",
+            "--format",
+            "ndjson",
+            "--filter",
+            "is_active=false",
+            "-o",
+            str(output),
+        )
+
+        lines = output.read_text().splitlines()
+        assert [json.loads(line)["email"] for line in lines] == [inactive.email]
+
+    def test_command_rejects_unknown_filter(self):
+        with pytest.raises(CommandError):
+            call_command("export_users", "--filter", "email=a@example.com")
@@ -0,0 +1,140 @@
+import json
+
+import pytest
+from django.contrib.auth.hashers import check_password
+from django.core.management import CommandError, call_command
+
+from apps.users import importing
+from apps.users.importing import import_users, read_rows
+from apps.users.models import User
+from apps.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def row(i, **kwargs):
+    return {
+        "email": f"user{i}@import.test",
+        "name": f"User {i}",
+        "password": "secret123",
+        **kwargs,
+    }
+
+
+class TestImportUsers:
+    def test_imports_in_chunks(self):
+        result = import_users(
+            (row(i) for i in range(5)), chunk_size=2, batch_size=2, workers=0
+        )
+
+        assert (result.read, result.imported, result.rejected) == (5, 5, 0)
+        user = User.objects.get(email="user3@import.test")
+        assert user.name == "User 3"
+        assert check_password("secret123", user.password)
+
+    def test_rejects(self):
+        UserFactory(email="user0@import.test")
+        rejected = []
+
+        result = import_users(
+            [row(0), row(1, password="short"), row(2, email="nope"), row(3), row(3)],
+            workers=0,
+            on_reject=lambda number, row, errors: rejected.append(
+                (number, list(errors))
+            ),
+        )
+
+        assert (result.read, result.imported, result.rejected) == (5, 1, 4)
+        assert sorted(rejected) == [
+            (1, ["email"]),
+            (2, ["password"]),
+            (3, ["email"]),
+            (5, ["email"]),
+        ]
+
+    def test_process_pool_hashing(self):
+        result = import_users([row(i) for i in range(3)], workers=2)
+
+        assert result.imported == 3
+        assert check_password(
+            "secret123", User.objects.get(email="user1@import.test").password
+        )
+
+
+class TestReadRows:
+    def test_csv_and_ndjson(self, tmp_path):
+        csv_file = tmp_path / "users.csv"
+        csv_file.write_text("email,name,password\na@x.test,A,secret123\n")
+        ndjson_file = tmp_path / "users.ndjson"
+        ndjson_file.write_text(json.dumps(row(1)) + "\n\n" + json.dumps(row(2)) + "\n")
+
+        assert list(read_rows(str(csv_file))) == [
+            {"email": "a@x.test", "name": "A", "password": "secret123"}
+        ]
+        assert list(read_rows(str(ndjson_file))) == [row(1), row(2)]
+
+    def test_malformed_ndjson_lines_are_rejected(self, tmp_path):
+        path = tmp_path / "users.ndjson"
+        path.write_text(f"{json.dumps(row(1))}\n\n{{oops\n{json.dumps(row(2))}\n")
+        rejected = []
+
+        result = import_users(
+            read_rows(str(path)),
+            workers=0,
+            on_reject=lambda number, row, errors: rejected.append(
+                (number, row, errors)
+            ),
+        )
+
+        assert (result.read, result.imported, result.rejected) == (3, 2, 1)
+        ((number, text, errors),) = rejected
+        assert (number, text) == (2, "{oops")
+        assert "line 3" in errors["non_field_errors"][0]
+
+    def test_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            list(read_rows(str(tmp_path / "users.xml")))
+
+
+def test_command(tmp_path, capsys):
+    path = tmp_path / "users.ndjson"
+    path.write_text("\n".join(json.dumps(r) for r in [row(1), row(2, email="bad")]))
+    rejects = tmp_path / "rejects.ndjson"
+
+    call_command("import_users", str(path), "--workers", "0", "--rejects", str(rejects))
+
+    out = capsys.readouterr().out
+    assert "Row 2 rejected" in out
+    assert "1 imported, 1 rejected, 0 conflicts" in out
+    reject = json.loads(rejects.read_text())
+    assert reject["row_number"] == 2 and "password" not in reject["row"]
+
+    with pytest.raises(CommandError):
+        call_command("import_users", str(tmp_path / "missing.csv"), "--workers", "0")
+
+
+def test_command_conflict_without_ignore_conflicts(tmp_path, monkeypatch):
+    path = tmp_path / "users.ndjson"
+    path.write_text("\n".join(json.dumps(r) for r in [row(1), row(2)]))
+    validate_chunk = importing.validate_chunk
+
+    def validate_then_race(chunk, result, on_reject):
+        valid = validate_chunk(chunk, result, on_reject)
+        if chunk[0]["email"] == row(2)["email"]:
+            # Another process inserts the email between validation and insert
+            UserFactory(email=row(2)["email"])
+        return valid
+
+    monkeypatch.setattr(importing, "validate_chunk", validate_then_race)
+
+    with pytest.raises(CommandError, match="after 1 users were imported"):
+        call_command(
+            "import_users",
+            str(path),
+            "--workers",
+            "0",
+            "--chunk-size",
+            "1",
+            "--no-ignore-conflicts",
+        )
+    assert User.objects.filter(email=row(1)["email"]).exists()
@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+import pytest
+from django.urls.base import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from apps.users import last_login
+from apps.users.last_login import LastLoginBuffer
+from apps.users.models import User
+from apps.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def buffer(monkeypatch):
+    """LastLoginBuffer flushed explicitly, without the background thread"""
+    buffer = LastLoginBuffer(interval=60, max_size=2)
+    monkeypatch.setattr(buffer, "start", lambda: None)
+    return buffer
+
+
+class TestLastLoginBuffer:
+    def test_flush_writes_pending_logins(self, buffer, django_assert_num_queries):
+        users = UserFactory.create_batch(3)
+        now = timezone.now()
+        for user in users:
+            buffer.record(user, now)
+
+        with django_assert_num_queries(1):
+            assert buffer.flush() == 3
+
+        assert len(buffer) == 0
+        assert User.objects.filter(last_login=now).count() == 3
+
+    def test_keeps_latest_timestamp(self, buffer, user):
+        now = timezone.now()
+        buffer.record(user, now)
+        buffer.record(user, now - timedelta(minutes=1))
+
+        buffer.flush()
+
+        user.refresh_from_db()
+        assert user.last_login == now
+
+    def test_flush_without_pending(self, buffer, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            assert buffer.flush() == 0
+
+    def test_size_threshold_wakes_flush_thread(self, buffer, user):
+        buffer.record(user)
+        assert not buffer._wakeup.is_set()
+
+        buffer.record(UserFactory())
+        assert buffer._wakeup.is_set()
+
+
+class TestLoginRecording:
+    def login(self, api_client, user, test_password):
+        url = reverse("api:token-obtain")
+        resp = api_client.post(
+            url, data={"email": user.email, "password": test_password}
+        )
+        assert resp.status_code == status.HTTP_200_OK
+
+    def test_sync_writes_last_login(self, settings, api_client, user, test_password):
+        settings.LAST_LOGIN_BUFFERED = False
+
+        self.login(api_client, user, test_password)
+
+        user.refresh_from_db()
+        assert user.last_login is not None
+
+    def test_buffered_defers_last_login(
+        self, settings, monkeypatch, buffer, api_client, user, test_password
+    ):
+        settings.LAST_LOGIN_BUFFERED = True
+        monkeypatch.setattr(last_login, "buffer", buffer)
+
+        self.login(api_client, user, test_password)
+
+        user.refresh_from_db()
+        assert user.last_login is None
+        assert len(buffer) == 1
+
+        buffer.flush()
+
+        user.refresh_from_db()
+        assert user.last_login is not None
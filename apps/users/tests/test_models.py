@@ -0,0 +1,66 @@
+import pytest
+from django.db import connection
+from django.urls.base import reverse
+from rest_framework import status
+
+from apps.users.models import User
+from apps.users.serializers import UserReadSerializer
+from apps.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestSoftDelete:
+    def test_objects_excludes_deleted(self):
+        live = UserFactory()
+        deleted = UserFactory(deleted=True)
+
+        assert list(User.objects.all()) == [live]
+        assert set(User.all_objects.all()) == {live, deleted}
+        assert User._default_manager is User.all_objects
+
+    def test_deleted_user_token_rejected(self, api_client, token, user: User):
+        User.objects.filter(pk=user.pk).soft_delete()
+
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token['access']}")
+        assert (
+            api_client.get(reverse("api:users-me")).status_code
+            == status.HTTP_401_UNAUTHORIZED
+        )
+
+        resp = api_client.post(
+            reverse("api:token-refresh"), {"refresh": token["refresh"]}
+        )
+        assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_deleted_user_cannot_login(self, api_client):
+        user = UserFactory(deleted=True)
+        user.set_password("password")
+        user.save()
+
+        resp = api_client.post(
+            reverse("api:token-obtain"), {"email": user.email, "password": "password"}
+        )
+
+        assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestLiveUserIndexes:
+    def test_list_is_an_index_only_scan(self):
+        UserFactory.create_batch(5)
+        UserFactory(deleted=True)
+        # The rows KeysetPagination reads for UserView's default list
+        queryset = UserReadSerializer.values(
+            User.objects.all(), extra=["pk", "created_at"]
+        )
+        queryset = queryset.order_by("created_at", "id")[:21]
+
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            assert (
+                "Index Only Scan using users_live_created_at_idx" in queryset.explain()
+            )
+        else:
+            # SQLite still reads `deleted` from the table to check the condition
+            assert "USING INDEX users_live_created_at_idx" in queryset.explain()
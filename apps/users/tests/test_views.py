@@ -1,10 +1,17 @@
+import csv
+import io
+import json
+
 import pytest
 from django.core import mail
+from django.db import connection
 from django.urls.base import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from apps.users.autocomplete import prefix_matches
 from apps.users.models import User
+from apps.users.tests.factories import UserFactory
 
 pytestmark = pytest.mark.django_db
 
@@ -57,6 +64,249 @@ class TestUserView:
         assert resp_data["email"] == user.email
 
 
+class TestUserDetailCache:
+    @pytest.fixture
+    def client(self, api_client, token):
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token['access']}")
+        return api_client
+
+    def test_me_cached(self, client, user: User, django_assert_num_queries):
+        url = reverse("api:users-me")
+        client.get(url)
+
+        # Only the token's user lookup is left
+        with django_assert_num_queries(1):
+            resp = client.get(url)
+
+        assert resp.json()["email"] == user.email
+
+    def test_retrieve_shares_me_cache(
+        self, client, user: User, django_assert_num_queries
+    ):
+        client.get(reverse("api:users-me"))
+
+        # The token's user and the ETag's updated_at
+        with django_assert_num_queries(2):
+            resp = client.get(reverse("api:users-detail", args=(user.id,)))
+
+        assert resp.json() == {
+            "email": user.email,
+            "name": user.name,
+            "id": str(user.id),
+        }
+
+    def test_invalidated_on_update(self, client, user: User):
+        url = reverse("api:users-me")
+        client.get(url)
+
+        client.patch(reverse("api:users-detail", args=(user.id,)), data={"name": "New"})
+        assert client.get(url).json()["name"] == "New"
+
+        user.refresh_from_db()
+        user.name = "Newer"
+        user.save()
+        assert client.get(url).json()["name"] == "Newer"
+
+    def test_other_users_not_served_from_cache(
+        self, api_client_auth, client, user: User
+    ):
+        client.get(reverse("api:users-me"))
+
+        resp = api_client_auth(UserFactory()).get(
+            reverse("api:users-detail", args=(user.id,))
+        )
+
+        assert resp.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestConditionalGet:
+    @pytest.fixture
+    def client(self, api_client, token):
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token['access']}")
+        return api_client
+
+    @pytest.fixture
+    def detail_url(self, user: User):
+        return reverse("api:users-detail", args=(user.id,))
+
+    def test_detail_not_modified(self, client, detail_url):
+        resp = client.get(detail_url)
+        etag = resp["ETag"]
+        assert not etag.startswith("W/")
+
+        resp = client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert resp.status_code == status.HTTP_304_NOT_MODIFIED
+        assert resp["ETag"] == etag
+
+        resp = client.get(detail_url, HTTP_IF_MODIFIED_SINCE=resp["Last-Modified"])
+        assert resp.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_detail_modified(self, client, detail_url, user: User):
+        etag = client.get(detail_url)["ETag"]
+
+        user.name = "Changed"
+        user.save()
+
+        resp = client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp["ETag"] != etag
+        assert resp.json()["name"] == "Changed"
+
+    def test_list_weak_etag(self, client, user: User):
+        url = reverse("api:users-list")
+        etag = client.get(url)["ETag"]
+        assert etag.startswith("W/")
+
+        resp = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert resp.status_code == status.HTTP_304_NOT_MODIFIED
+
+        user.name = "Changed"
+        user.save()
+        assert (
+            client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+        )
+
+    def test_patch_if_match(self, client, detail_url, user: User):
+        etag = client.get(detail_url)["ETag"]
+
+        resp = client.patch(detail_url, data={"name": "First"}, HTTP_IF_MATCH=etag)
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp["ETag"] != etag
+        assert resp["ETag"] == client.get(detail_url)["ETag"]
+
+        # A second client still holding the old ETag loses the race
+        resp = client.patch(detail_url, data={"name": "Second"}, HTTP_IF_MATCH=etag)
+        assert resp.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+        user.refresh_from_db()
+        assert user.name == "First"
+
+
+class TestAutocomplete:
+    url = reverse("api:users-autocomplete")
+
+    @pytest.fixture
+    def staff_client(self, api_client_auth):
+        return api_client_auth(UserFactory(is_staff=True, email="staff@corp.test"))
+
+    def test_prefix_matches(self, staff_client):
+        robert = UserFactory(name="Robert Smith", email="bob@example.com")
+        roberta = UserFactory(name="Roberta Jones", email="rj@example.com")
+        UserFactory(name="Alice", email="alice@example.com")
+        UserFactory(name="Rob Deleted", email="rd@example.com", deleted=True)
+
+        resp = staff_client.get(self.url, {"q": "ROB"})
+
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.json() == [
+            {"id": str(robert.id), "name": robert.name, "email": robert.email},
+            {"id": str(roberta.id), "name": roberta.name, "email": roberta.email},
+        ]
+
+    def test_email_matches_first_and_limit(self, staff_client):
+        by_name = UserFactory(name="Bob", email="zed@example.com")
+        by_email = UserFactory(name="Zed", email="bob@example.com")
+
+        data = staff_client.get(self.url, {"q": "bob"}).json()
+        assert [row["id"] for row in data] == [str(by_email.id), str(by_name.id)]
+
+        data = staff_client.get(self.url, {"q": "bob", "limit": 1}).json()
+        assert [row["id"] for row in data] == [str(by_email.id)]
+
+    def test_cached_until_users_change(self, staff_client, django_assert_num_queries):
+        UserFactory(name="Carol")
+        staff_client.get(self.url, {"q": "car"})
+
+        with django_assert_num_queries(0):
+            staff_client.get(self.url, {"q": "car"})
+
+        UserFactory(name="Carla")
+        assert len(staff_client.get(self.url, {"q": "car"}).json()) == 2
+
+    @pytest.mark.skipif(
+        connection.vendor != "postgresql", reason="prefix indexes are PostgreSQL only"
+    )
+    @pytest.mark.parametrize("field", ["email", "name"])
+    def test_prefix_scan_needs_no_sort(self, field):
+        UserFactory.create_batch(5)
+        queryset = prefix_matches(User.objects.all(), field, "u", 10)
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = queryset.explain()
+
+        assert f"users_{field}_prefix_idx" in plan
+        assert "Sort" not in plan
+
+    def test_empty_prefix(self, staff_client):
+        assert staff_client.get(self.url).json() == []
+
+    def test_staff_only(self, api_client_auth, user: User):
+        resp = api_client_auth(user).get(self.url, {"q": "a"})
+
+        assert resp.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestExport:
+    url = reverse("api:users-export")
+
+    @pytest.fixture
+    def staff_client(self, api_client_auth):
+        return api_client_auth(UserFactory(is_staff=True, email="staff@corp.test"))
+
+    def test_csv(self, staff_client):
+        user = UserFactory(name="Ann, Jr.")
+        UserFactory(deleted=True)
+
+        resp = staff_client.get(self.url)
+        rows = list(csv.reader(io.StringIO(b"".join(resp.streaming_content).decode())))
+
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp["Content-Type"] == "text/csv"
+        assert resp["Content-Disposition"] == 'attachment; filename="users.csv"'
+        assert rows[0] == [
+            "id",
+            "email",
+            "name",
+            "is_active",
+            "created_at",
+            "last_login",
+        ]
+        assert sorted(row[1] for row in rows[1:]) == sorted(
+            ["staff@corp.test", user.email]
+        )
+        assert [row[2] for row in rows if row[1] == user.email] == ["Ann, Jr."]
+
+    def test_csv_neutralises_formulas(self, staff_client):
+        user = UserFactory(name='=HYPERLINK("http://evil.test")')
+
+        resp = staff_client.get(self.url, {"export_format": "csv"})
+        rows = list(csv.reader(io.StringIO(b"".join(resp.streaming_content).decode())))
+
+        assert [row[2] for row in rows if row[1] == user.email] == [
+            '\'=HYPERLINK("http://evil.test")'
+        ]
+
+    def test_ndjson_filtered(self, staff_client):
+        inactive = UserFactory(is_active=False)
+
+        resp = staff_client.get(
+            self.url, {"export_format": "ndjson", "is_active": "false"}
+        )
+        lines = b"".join(resp.streaming_content).decode().splitlines()
+
+        assert resp["Content-Type"] == "application/x-ndjson"
+        assert [json.loads(line)["id"] for line in lines] == [str(inactive.id)]
+
+    def test_invalid_format(self, staff_client):
+        resp = staff_client.get(self.url, {"export_format": "xml"})
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_staff_only(self, api_client_auth, user):
+        resp = api_client_auth(user).get(self.url)
+        assert resp.status_code == status.HTTP_403_FORBIDDEN
+
+
 class TestAuthView:
     def test_login(self, api_client: APIClient, user: User, test_password):
         url = reverse("api:token-obtain")
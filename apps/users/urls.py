@@ -1,7 +1,11 @@
+from django.conf import settings
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from apps.common.decorators import autocommit_request
+
+from . import async_views
 from .views import (
     ChangePasswordView,
     ForgotPasswordView,
@@ -17,10 +21,41 @@ router.register("users", UserView, basename="users")
 
 urlpatterns = [
     path("auth/signup/", SignUpView.as_view(), name="signup"),
-    path("auth/login/", TokenObtainPairView.as_view(), name="token-obtain"),
-    path("auth/refresh-token/", TokenRefreshView.as_view(), name="token-refresh"),
+    # Token views only read, last_login is written by apps.users.last_login
+    path(
+        "auth/login/",
+        autocommit_request(TokenObtainPairView.as_view()),
+        name="token-obtain",
+    ),
+    path(
+        "auth/refresh-token/",
+        autocommit_request(TokenRefreshView.as_view()),
+        name="token-refresh",
+    ),
     path("auth/forget-password/", ForgotPasswordView.as_view(), name="forget-password"),
     path("auth/reset-password/", ResetPasswordView.as_view(), name="reset-password"),
     path("auth/change-password/", ChangePasswordView.as_view(), name="change-password"),
     path("", include(router.urls)),
 ]
+
+if settings.ASYNC_AUTH_VIEWS:
+    # Native async endpoints for ASGI, matched before the sync views above
+    urlpatterns = [
+        path("auth/signup/", async_views.SignUpView.as_view(), name="signup"),
+        path(
+            "auth/forget-password/",
+            async_views.ForgotPasswordView.as_view(),
+            name="forget-password",
+        ),
+        path(
+            "auth/reset-password/",
+            async_views.ResetPasswordView.as_view(),
+            name="reset-password",
+        ),
+        path(
+            "auth/change-password/",
+            async_views.ChangePasswordView.as_view(),
+            name="change-password",
+        ),
+        path("users/me/", async_views.MeView.as_view(), name="users-me"),
+    ] + urlpatterns
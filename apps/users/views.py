@@ -1,20 +1,37 @@
 from django.contrib.auth import get_user_model
+from django.http import StreamingHttpResponse
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import CreateAPIView
 from rest_framework.mixins import ListModelMixin, RetrieveModelMixin, UpdateModelMixin
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
+from rest_framework_simplejwt.models import TokenUser
 
+from apps.common import routers
+from apps.common.cache import get_or_compute, serializer_cache_key
+from apps.common.pagination import KeysetPagination
+from apps.common.views import (
+    ConditionalGetMixin,
+    FastReadMixin,
+    ReplicaReadMixin,
+    ServerTimingMixin,
+    StreamingListMixin,
+)
+
+from .autocomplete import autocomplete_users
+from .exporting import CONTENT_TYPES, export_users, filter_users
 from .serializers import (
     ChangePasswordSerializer,
     ForgotPasswordSerializer,
     ResetPasswordSerializer,
     SignupResponseSerializer,
     SignUpSerializer,
+    UserReadSerializer,
     UserSerializer,
 )
 
@@ -28,39 +45,172 @@ response_schema = openapi.Schema(
     },
 )
 
+autocomplete_schema = openapi.Schema(
+    type=openapi.TYPE_ARRAY,
+    items=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={
+            "id": openapi.Schema(type=openapi.TYPE_STRING),
+            "name": openapi.Schema(type=openapi.TYPE_STRING),
+            "email": openapi.Schema(type=openapi.TYPE_STRING),
+        },
+    ),
+)
+
 forget_password_schema = openapi.Schema(
     type=openapi.TYPE_OBJECT,
     properties={"token": openapi.Schema(type=openapi.TYPE_STRING)},
 )
 
 
-class UserView(RetrieveModelMixin, UpdateModelMixin, ListModelMixin, GenericViewSet):
+class UserView(
+    ServerTimingMixin,
+    ConditionalGetMixin,
+    ReplicaReadMixin,
+    FastReadMixin,
+    StreamingListMixin,
+    RetrieveModelMixin,
+    UpdateModelMixin,
+    ListModelMixin,
+    GenericViewSet,
+):
     """
     User viewset
     """
 
     serializer_class = UserSerializer
+    fast_read_serializer_class = UserReadSerializer
     queryset = User.objects.all()
-    filterset_fields = ["is_active", "deleted"]
+    pagination_class = KeysetPagination
+    filterset_fields = ["is_active"]
     search_fields = [
         "email",
-        "name",
+        "@name",
     ]
+    # stored tsvector column added by migration 0006 on PostgreSQL
+    search_vectors = {"name": "name_search"}
+    ordering_fields = ["created_at", "email"]
+    # seconds `me` and the user's own detail are served from cache, then
+    # served stale for `detail_cache_stale` more while one request refreshes
+    detail_cache_timeout = 60
+    detail_cache_stale = 300
+    autocomplete_limit = 10
+    autocomplete_max_limit = 50
+    export_chunk_size = 2000
 
     def get_queryset(self):
         user = self.request.user
+        queryset = super().get_queryset()
         if user.is_anonymous:
-            return self.queryset.none()
-        return self.queryset.filter(id=user.id)
+            return queryset.none()
+        return queryset.filter(id=user.id)
+
+    def get_cached_detail(self, pk, compute):
+        """
+        UserSerializer data of user `pk`, cached until the user changes
+        (see apps.users.signals)
+        """
+        return get_or_compute(
+            serializer_cache_key(UserSerializer, pk),
+            lambda: dict(compute()),
+            self.detail_cache_timeout,
+            self.detail_cache_stale,
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        # Users only see themselves, other ids are left to the 404 path
+        if kwargs.get("pk") != str(request.user.pk) or request.query_params:
+            return super().retrieve(request, *args, **kwargs)
+
+        return self.conditional_retrieve(self.retrieve_cached, request, *args, **kwargs)
+
+    def retrieve_cached(self, request, *args, **kwargs):
+        def serialize():
+            return self.get_serializer(self.get_object()).data
+
+        return Response(self.get_cached_detail(request.user.pk, serialize))
 
     @swagger_auto_schema(method="GET", responses={200: UserSerializer})
     @action(detail=False, methods=["GET"])
     def me(self, request):
-        serializer = UserSerializer(request.user, context={"request": request})
-        return Response(status=status.HTTP_200_OK, data=serializer.data)
+        def serialize():
+            serializer = UserSerializer(request.user, context={"request": request})
+            return serializer.data
+
+        # Token claims already hold the data without a query
+        if isinstance(request.user, TokenUser):
+            return Response(status=status.HTTP_200_OK, data=serialize())
+
+        data = self.get_cached_detail(request.user.pk, serialize)
+        return Response(status=status.HTTP_200_OK, data=data)
+
+    @swagger_auto_schema(
+        method="GET",
+        manual_parameters=[
+            openapi.Parameter("q", openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter("limit", openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+        ],
+        responses={200: autocomplete_schema},
+    )
+    @action(detail=False, methods=["GET"], permission_classes=[IsAdminUser])
+    def autocomplete(self, request):
+        """
+        Staff user pickers: users whose email or name starts with `q`, without
+        the search filters, pagination and count of the list
+        """
+        try:
+            limit = int(request.query_params.get("limit", self.autocomplete_limit))
+        except ValueError:
+            limit = self.autocomplete_limit
+        limit = max(1, min(limit, self.autocomplete_max_limit))
+
+        alias = routers.replica_for(request)
+        results = autocomplete_users(request.query_params.get("q", ""), limit, alias)
+        return Response(status=status.HTTP_200_OK, data=results)
+
+    @swagger_auto_schema(
+        method="GET",
+        manual_parameters=[
+            openapi.Parameter(
+                "export_format",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=list(CONTENT_TYPES),
+            ),
+        ],
+        responses={200: "CSV or NDJSON stream of users"},
+    )
+    @action(detail=False, methods=["GET"], permission_classes=[IsAdminUser])
+    def export(self, request):
+        """
+        Staff export of all live users as CSV (default) or NDJSON, filtered by
+        `filterset_fields` and streamed from a server-side cursor
+        """
+        export_format = request.query_params.get("export_format", "csv")
+        if export_format not in CONTENT_TYPES:
+            raise ValidationError(
+                {"export_format": [f"Choose one of {list(CONTENT_TYPES)}."]}
+            )
+
+        queryset, errors = filter_users(
+            User.objects.all(), request.query_params, self.filterset_fields
+        )
+        if errors:
+            raise ValidationError(errors)
+        if alias := routers.replica_for(request):
+            queryset = queryset.using(alias)
+
+        response = StreamingHttpResponse(
+            export_users(queryset, export_format, self.export_chunk_size),
+            content_type=CONTENT_TYPES[export_format],
+        )
+        response[
+            "Content-Disposition"
+        ] = f'attachment; filename="users.{export_format}"'
+        return response
 
 
-class SignUpView(CreateAPIView):
+class SignUpView(ServerTimingMixin, CreateAPIView):
     serializer_class = SignUpSerializer
     permission_classes = [AllowAny]
 
@@ -76,7 +226,7 @@ class SignUpView(CreateAPIView):
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
 
-class ForgotPasswordView(CreateAPIView):
+class ForgotPasswordView(ServerTimingMixin, CreateAPIView):
     serializer_class = ForgotPasswordSerializer
     permission_classes = [AllowAny]
 
@@ -89,7 +239,7 @@ class ForgotPasswordView(CreateAPIView):
         return Response(data, status=status.HTTP_200_OK)
 
 
-class ResetPasswordView(CreateAPIView):
+class ResetPasswordView(ServerTimingMixin, CreateAPIView):
     serializer_class = ResetPasswordSerializer
     permission_classes = [AllowAny]
 
@@ -104,6 +254,6 @@ class ResetPasswordView(CreateAPIView):
         )
 
 
-class ChangePasswordView(CreateAPIView):
+class ChangePasswordView(ServerTimingMixin, CreateAPIView):
     serializer_class = ChangePasswordSerializer
     permission_classes = [IsAuthenticated]
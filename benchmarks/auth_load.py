@@ -0,0 +1,123 @@
+"""
+Load test the auth endpoints of running servers, to compare the sync views
+under WSGI with the async views (ASYNC_AUTH_VIEWS) under ASGI.
+
+    gunicorn config.wsgi -w 4 -b 127.0.0.1:8000
+    ASYNC_AUTH_VIEWS=on gunicorn config.asgi -w 4 -k uvicorn.workers.UvicornWorker -b 127.0.0.1:8001
+
+    python -m benchmarks.auth_load http://127.0.0.1:8000 http://127.0.0.1:8001
+
+Reports requests/sec and latency percentiles per server and endpoint. Only
+the standard library is used on the client side, with one keep-alive
+connection per client thread.
+"""
+import argparse
+import http.client
+import json
+import statistics
+import threading
+import time
+import uuid
+from urllib.parse import urlsplit
+
+from benchmarks.utils import output
+
+ENDPOINTS = {
+    "me": ("GET", "/api/users/me/", None),
+    "forget-password": ("POST", "/api/auth/forget-password/", "email"),
+}
+
+
+class Client:
+    def __init__(self, base_url):
+        url = urlsplit(base_url)
+        self.connection = http.client.HTTPConnection(url.hostname, url.port or 80)
+
+    def request(self, method, path, data=None, token=None):
+        headers = {"Content-Type": "application/json"}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        body = json.dumps(data) if data is not None else None
+
+        self.connection.request(method, path, body=body, headers=headers)
+        response = self.connection.getresponse()
+        content = response.read()
+        return response.status, content
+
+
+def signup(base_url):
+    email = f"load-{uuid.uuid4().hex[:12]}@bench.local"
+    password = uuid.uuid4().hex
+    data = {"email": email, "password": password, "password2": password}
+
+    status, content = Client(base_url).request("POST", "/api/auth/signup/", data)
+    if status != 201:
+        raise SystemExit(f"signup on {base_url} failed with {status}: {content[:200]}")
+    return email, json.loads(content)["token"]["access"]
+
+
+def run(base_url, endpoint, email, token, requests, concurrency):
+    method, path, payload = ENDPOINTS[endpoint]
+    data = {"email": email} if payload == "email" else None
+    timings, errors = [], []
+    lock = threading.Lock()
+
+    def worker(count):
+        client = Client(base_url)
+        local_timings, local_errors = [], 0
+        for _ in range(count):
+            start = time.perf_counter()
+            status, _ = client.request(method, path, data, token)
+            local_timings.append((time.perf_counter() - start) * 1000)
+            local_errors += status >= 400
+        with lock:
+            timings.extend(local_timings)
+            errors.append(local_errors)
+
+    per_thread = max(requests // concurrency, 1)
+    threads = [
+        threading.Thread(target=worker, args=(per_thread,)) for _ in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    timings.sort()
+    return {
+        "rps": len(timings) / elapsed,
+        "p50": statistics.median(timings),
+        "p99": timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+        "errors": sum(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("urls", nargs="+", help="Base URLs of the servers to compare")
+    parser.add_argument("--endpoint", choices=ENDPOINTS, action="append")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    for base_url in args.urls:
+        email, token = signup(base_url)
+        for endpoint in args.endpoint or list(ENDPOINTS):
+            # warm up connections and caches
+            run(base_url, endpoint, email, token, args.concurrency, args.concurrency)
+            stats = run(
+                base_url, endpoint, email, token, args.requests, args.concurrency
+            )
+            output(
+                f"{base_url:<28} {endpoint:<16} {stats['rps']:9.1f} req/s  "
+                f"p50={stats['p50']:8.2f}ms  p99={stats['p99']:8.2f}ms  "
+                f"errors={stats['errors']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
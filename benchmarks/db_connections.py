@@ -0,0 +1,91 @@
+"""
+Compare connect-per-request, persistent (CONN_MAX_AGE) and pooled
+connections under concurrent short requests. Needs a PostgreSQL
+DATABASE_URL and psycopg 3 with the pool extra (requirements/prod.txt).
+
+    DATABASE_URL=postgres://localhost/app python -m benchmarks.db_connections --threads 16
+
+Each simulated request runs one primary key lookup on its own thread and then
+ends like a Django request does, through close_if_unusable_or_obsolete().
+"""
+import argparse
+import statistics
+import threading
+import time
+
+from benchmarks.utils import output, seed_users, setup
+
+MODES = {
+    "per-request": {"CONN_MAX_AGE": 0},
+    "conn-max-age": {"CONN_MAX_AGE": 60},
+    "pooled": {"CONN_MAX_AGE": 0, "pool": True},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--pool-size", type=int, default=8)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.db import connections
+
+    from apps.users.models import User
+
+    if connections["default"].vendor != "postgresql":
+        raise SystemExit("Set DATABASE_URL to a PostgreSQL database")
+
+    seed_users(1000)
+    user_id = User.objects.values_list("id", flat=True).first()
+    base = connections["default"].settings_dict
+
+    for name, mode in MODES.items():
+        settings_dict = {**base, "CONN_MAX_AGE": mode["CONN_MAX_AGE"]}
+        settings_dict["OPTIONS"] = {**base.get("OPTIONS", {})}
+        if mode.get("pool"):
+            settings_dict["OPTIONS"]["pool"] = {
+                "min_size": args.pool_size,
+                "max_size": args.pool_size,
+            }
+        connections.settings[name] = settings_dict
+
+        timings = []
+        lock = threading.Lock()
+
+        def worker(count, alias=name):
+            local = []
+            for _ in range(count):
+                start = time.perf_counter()
+                User.objects.using(alias).filter(id=user_id).first()
+                connections[alias].close_if_unusable_or_obsolete()
+                local.append((time.perf_counter() - start) * 1000)
+            connections[alias].close()
+            with lock:
+                timings.extend(local)
+
+        threads = [
+            threading.Thread(target=worker, args=(args.requests // args.threads,))
+            for _ in range(args.threads)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        timings.sort()
+        output(
+            f"{name:<14} {len(timings) / elapsed:9.1f} req/s  "
+            f"p50={statistics.median(timings):7.2f}ms  "
+            f"p99={timings[int(len(timings) * 0.99)]:7.2f}ms"
+        )
+        if mode.get("pool"):
+            connections[name].close_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Compare exact, estimated and cached counts of FastCountPagination.
+
+    python -m benchmarks.pagination_count --users 1000000
+"""
+import argparse
+
+from benchmarks.utils import measure, report, seed_users, setup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from apps.common.pagination import FastCountPagination
+    from apps.users.models import User
+
+    class Estimated(FastCountPagination):
+        estimate_count = True
+
+    class Cached(FastCountPagination):
+        count_cache_timeout = 60
+
+    seed_users(args.users)
+    request = Request(APIRequestFactory().get("/users/", {"page": 10}))
+
+    for name, pagination_class in (
+        ("exact", FastCountPagination),
+        ("estimated", Estimated),
+        ("cached", Cached),
+    ):
+        for label, queryset in (
+            ("all", User.objects.all()),
+            ("filtered", User.objects.filter(is_active=True)),
+        ):
+            stats = measure(
+                lambda: pagination_class().paginate_queryset(queryset, request),
+                repeat=args.repeat,
+            )
+            report(f"{name} / {label}", stats)
+
+
+if __name__ == "__main__":
+    main()
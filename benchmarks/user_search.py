@@ -0,0 +1,54 @@
+"""
+Latency of UserView searches with DRF's SearchFilter (ILIKE on every column)
+against IndexedSearchFilter (pg_trgm index for email, stored tsvector for
+name). Needs a PostgreSQL DATABASE_URL for the indexes to exist.
+
+    DATABASE_URL=postgres://localhost/app python -m benchmarks.user_search --users 1000000
+"""
+import argparse
+
+from benchmarks.utils import measure, output, report, seed_users, setup
+
+TERMS = ["user4242", "bench.local", "Bench User 99999", "zzz"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.db import connection
+    from rest_framework.filters import SearchFilter
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from apps.common.filters import IndexedSearchFilter
+    from apps.users.models import User
+    from apps.users.views import UserView
+
+    if connection.vendor != "postgresql":
+        output("Not PostgreSQL: both filters scan the table")
+
+    seed_users(args.users)
+    view = UserView()
+    factory = APIRequestFactory()
+
+    # SearchFilter has no stored vector, it searches name with ILIKE as it used to
+    for name, backend, search_fields in (
+        ("SearchFilter", SearchFilter(), ["email", "name"]),
+        ("Indexed", IndexedSearchFilter(), UserView.search_fields),
+    ):
+        view.search_fields = search_fields
+        for term in TERMS:
+            request = Request(factory.get("/users/", {"search": term}))
+            queryset = backend.filter_queryset(request, User.objects.all(), view)[:20]
+            report(
+                f"{name} {term!r}", measure(lambda: list(queryset.all()), args.repeat)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Rows/sec of UserSerializer on model instances against UserReadSerializer on
+values_list rows, including the query.
+
+    python -m benchmarks.user_serializer --rows 10000
+"""
+import argparse
+
+from benchmarks.utils import measure, output, seed_users, setup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    setup()
+
+    from apps.users.models import User
+    from apps.users.serializers import UserReadSerializer, UserSerializer
+
+    seed_users(args.rows)
+    queryset = User.objects.order_by("created_at", "id")[: args.rows]
+
+    def model_serializer():
+        return UserSerializer(queryset.all(), many=True).data
+
+    def values_serializer():
+        rows = UserReadSerializer.values(queryset.all(), extra=["created_at"])
+        return UserReadSerializer(rows, many=True).data
+
+    for name, func in (
+        ("UserSerializer", model_serializer),
+        ("UserReadSerializer", values_serializer),
+    ):
+        stats = measure(func, repeat=args.repeat)
+        output(f"{name:<24} {args.rows / stats['mean'] * 1000:12,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
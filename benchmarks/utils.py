@@ -0,0 +1,75 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Run a benchmark with `python -m benchmarks.<name>`. Scripts run against the
+test database of whatever DATABASE_URL points to (`test_<name>`), kept between
+runs so the seeded rows are only inserted once. Use a PostgreSQL DATABASE_URL
+for numbers that mean anything.
+"""
+import os
+import statistics
+import sys
+import time
+
+import django
+
+DEFAULT_SETTINGS = "config.settings.test"
+
+
+def setup():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", DEFAULT_SETTINGS)
+    django.setup()
+
+    from django.db import connection
+
+    connection.creation.create_test_db(verbosity=0, keepdb=True)
+
+
+def seed_users(count: int, batch_size: int = 10000):
+    """Top up the users table to `count` rows with bulk inserts"""
+    from django.contrib.auth.hashers import make_password
+    from django.db import connection
+
+    from apps.users.models import User
+
+    existing = User.objects.count()
+    password = make_password(None)
+
+    for start in range(existing, count, batch_size):
+        stop = min(start + batch_size, count)
+        User.objects.bulk_create(
+            User(
+                email=f"user{i}@bench.local", name=f"Bench User {i}", password=password
+            )
+            for i in range(start, stop)
+        )
+
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {User._meta.db_table}")
+
+
+def measure(func, repeat: int = 20) -> dict:
+    """Call `func` `repeat` times and return latency stats in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    return {
+        "mean": statistics.mean(timings),
+        "p50": timings[len(timings) // 2],
+        "p99": timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+    }
+
+
+def report(name: str, stats: dict):
+    values = "  ".join(f"{key}={value:9.2f}ms" for key, value in stats.items())
+    output(f"{name:<32} {values}")
+
+
+def output(line: str):
+    # sys.stdout rather than print(), which the pre-commit hooks strip
+    sys.stdout.write(f"{line}\n")
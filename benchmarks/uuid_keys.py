@@ -0,0 +1,71 @@
+"""
+Compare insert throughput and primary key index size of UUIDv4 and UUIDv7
+keys (apps.common.ids). Needs a PostgreSQL DATABASE_URL.
+
+    DATABASE_URL=postgres://localhost/app python -m benchmarks.uuid_keys --rows 5000000
+
+Each key version fills its own table shaped like a narrow BaseModel table, in
+batches inserted in their own transactions like request traffic would. The
+index stops fitting in shared_buffers long before 5M rows with v4 keys, which
+is where the gap shows.
+"""
+import argparse
+import time
+import uuid
+
+from benchmarks.utils import output, setup
+
+TABLE_SQL = """
+CREATE TABLE {table} (
+    id uuid PRIMARY KEY,
+    created_at timestamptz NOT NULL DEFAULT now(),
+    email varchar(255) NOT NULL
+)
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.db import connection, transaction
+
+    from apps.common.ids import uuid7
+
+    if connection.vendor != "postgresql":
+        raise SystemExit("Set DATABASE_URL to a PostgreSQL database")
+
+    for name, generate in (("v4", uuid.uuid4), ("v7", uuid7)):
+        table = f"bench_uuid_{name}"
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+            cursor.execute(TABLE_SQL.format(table=table))
+
+        sql = f"INSERT INTO {table} (id, email) VALUES (%s, %s)"
+        start = time.perf_counter()
+        for offset in range(0, args.rows, args.batch_size):
+            rows = [
+                (generate(), f"user{i}@bench.local")
+                for i in range(offset, min(offset + args.batch_size, args.rows))
+            ]
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.executemany(sql, rows)
+        elapsed = time.perf_counter() - start
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT pg_relation_size('{table}_pkey')")
+            (index_size,) = cursor.fetchone()
+            cursor.execute(f"DROP TABLE {table}")
+
+        output(
+            f"{name}  {args.rows / elapsed:10.0f} rows/s  "
+            f"pkey={index_size / 1024 / 1024:8.1f}MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from datetime import timedelta
 from pathlib import Path
 
@@ -59,19 +60,25 @@ THIRD_PARTY_APPS = [
 ]
 
 LOCAL_APPS = [
+    "apps.common.apps.CommonConfig",
     "apps.users.apps.UsersConfig",
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    # times everything below it, keep first
+    "apps.common.middleware.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
+    "apps.common.middleware.ReplicaPinMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    # calls the view itself, keep after every middleware with process_view
+    "apps.common.middleware.SelectiveAtomicRequestsMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -102,7 +109,24 @@ WSGI_APPLICATION = "config.wsgi.application"
 # ---------------------------------
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 DATABASES = {"default": env.db("DATABASE_URL", default="sqlite:///db.sqlite3")}
-DATABASES["default"]["ATOMIC_REQUESTS"] = True
+# Unsafe requests run in a transaction through SelectiveAtomicRequestsMiddleware
+DATABASES["default"]["ATOMIC_REQUESTS"] = False
+
+# Read replicas, see apps.common.routers. DATABASE_REPLICA_URLS become the
+# aliases replica1, replica2... weighted by DATABASE_REPLICA_WEIGHTS (default 1).
+DATABASE_REPLICAS = {}
+_replica_weights = env.list("DATABASE_REPLICA_WEIGHTS", cast=int, default=[])
+for _i, _url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[])):
+    DATABASES[f"replica{_i + 1}"] = {
+        **env.db_url_config(_url),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS[f"replica{_i + 1}"] = (
+        _replica_weights[_i] if _i < len(_replica_weights) else 1
+    )
+DATABASE_ROUTERS = ["apps.common.routers.ReplicaRouter"]
+# Seconds a client reads from the primary after writing
+DATABASE_REPLICA_PIN_SECONDS = env.int("DATABASE_REPLICA_PIN_SECONDS", default=5)
 
 
 AUTH_USER_MODEL = "users.User"
@@ -126,6 +150,22 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# https://docs.djangoproject.com/en/dev/ref/settings/#password-hashers
+PASSWORD_HASHERS = [
+    "apps.common.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+# PBKDF2 iterations, 0 keeps Django's default.
+# `manage.py calibrate_password_hasher` measures a value for this host.
+PASSWORD_HASHER_ITERATIONS = env.int("PASSWORD_HASHER_ITERATIONS", default=0)
+# Threads hashing passwords (apps.common.hashers), 0 hashes in the request thread
+PASSWORD_HASHING_WORKERS = env.int(
+    "PASSWORD_HASHING_WORKERS", default=os.cpu_count() or 1
+)
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
@@ -149,6 +189,10 @@ STATIC_URL = "static/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# BaseModel ids: time-ordered UUIDv7 instead of random UUIDv4, which keeps
+# inserts at the end of the primary key index (see apps.common.ids)
+USE_UUID7_PRIMARY_KEYS = env.bool("USE_UUID7_PRIMARY_KEYS", default=False)
+
 
 # LOGGING
 # ------------------------------
@@ -171,6 +215,15 @@ LOGGING = {
     "root": {"level": "INFO", "handlers": ["console"]},
 }
 
+# apps.common.middleware.ServerTimingMiddleware: the fraction of requests
+# instrumented (DB queries and view phases, logged), whether they get a
+# Server-Timing header, and the wall time above which any request is logged.
+# The header shows query counts and DB time to any client, keep it off where
+# clients are not trusted.
+SERVER_TIMING_SAMPLE_RATE = env.float("SERVER_TIMING_SAMPLE_RATE", default=0.01)
+SERVER_TIMING_HEADER = env.bool("SERVER_TIMING_HEADER", default=False)
+SERVER_TIMING_SLOW_MS = env.float("SERVER_TIMING_SLOW_MS", default=1000)
+
 
 # django-rest-framework
 # -------------------------------------------------------------------------------
@@ -178,17 +231,16 @@ LOGGING = {
 REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "apps.common.pagination.DefaultPagination",
     "PAGE_SIZE": 20,
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("apps.common.authentication.JWTAuthentication",),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
-        "rest_framework.filters.SearchFilter",
+        "apps.common.filters.IndexedSearchFilter",
         # "rest_framework.filters.OrderingFilter",
         "apps.common.utils.CustomOrderingFilter",
     ],
     # "EXCEPTION_HANDLER": "apps.common.exception_handler.api_exception_handler",
+    # StreamingRenderer writes the same envelope and streams large lists
     # "DEFAULT_RENDERER_CLASSES": [
     #     "apps.common.renderers.CustomRenderer",
     #     "rest_framework.renderers.BrowsableAPIRenderer",
@@ -204,11 +256,52 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=3),
     "USER_ID_FIELD": "id",
     "USER_ID_CLAIM": "user_id",
-    "USER_AUTHENTICATION_RULE": "rest_framework_simplejwt.authentication.default_user_authentication_rule",
-    "TOKEN_OBTAIN_SERIALIZER": "rest_framework_simplejwt.serializers.TokenObtainPairSerializer",
-    "UPDATE_LAST_LOGIN": True,
+    "USER_AUTHENTICATION_RULE": "apps.common.authentication.user_authentication_rule",
+    "TOKEN_OBTAIN_SERIALIZER": "apps.users.serializers.TokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "apps.users.serializers.TokenRefreshSerializer",
+    # last_login is recorded by apps.users.serializers.TokenObtainPairSerializer
+    "UPDATE_LAST_LOGIN": False,
 }
 
+# How apps.common.authentication.JWTAuthentication resolves request.user:
+# "db" loads the user on every request, "cache" keeps recently seen users in a
+# per-process LRU cache and "claims" builds the user from the token claims.
+JWT_USER_RESOLUTION = env("JWT_USER_RESOLUTION", default="db")
+JWT_USER_CACHE_SIZE = env.int("JWT_USER_CACHE_SIZE", default=1024)
+JWT_USER_CACHE_TTL = env.int("JWT_USER_CACHE_TTL", default=60)
+
+# Logins buffer last_login in memory and write it in batches every
+# LAST_LOGIN_FLUSH_INTERVAL seconds or LAST_LOGIN_FLUSH_SIZE users.
+# Set LAST_LOGIN_BUFFERED to False to write it during the login request.
+LAST_LOGIN_BUFFERED = env.bool("LAST_LOGIN_BUFFERED", default=True)
+LAST_LOGIN_FLUSH_INTERVAL = env.float("LAST_LOGIN_FLUSH_INTERVAL", default=5)
+LAST_LOGIN_FLUSH_SIZE = env.int("LAST_LOGIN_FLUSH_SIZE", default=500)
+
+# Serve signup, forgot/reset/change password and users/me from the native
+# async views in apps.users.async_views. Enable when running config.asgi.
+ASYNC_AUTH_VIEWS = env.bool("ASYNC_AUTH_VIEWS", default=False)
+
+# Per-process LRU cache of users/autocomplete results, by prefix
+USER_AUTOCOMPLETE_CACHE_SIZE = env.int("USER_AUTOCOMPLETE_CACHE_SIZE", default=4096)
+USER_AUTOCOMPLETE_CACHE_TTL = env.int("USER_AUTOCOMPLETE_CACHE_TTL", default=30)
+
+# Days soft deleted users stay in users_user before `manage.py
+# archive_deleted_users` moves them to the ArchivedUser table
+USER_ARCHIVE_AFTER_DAYS = env.int("USER_ARCHIVE_AFTER_DAYS", default=30)
+
+
+# EMAIL
+# ------------------------------------------------------------------------------
+# How apps.common.email hands messages over: "sync" sends them in the request,
+# "thread" passes them to in-process workers after commit and "queue" stores
+# them in the QueuedEmail outbox for the send_queued_emails command.
+EMAIL_DISPATCH_MODE = env("EMAIL_DISPATCH_MODE", default="thread")
+EMAIL_DISPATCH_WORKERS = env.int("EMAIL_DISPATCH_WORKERS", default=2)
+EMAIL_DISPATCH_BATCH_SIZE = env.int("EMAIL_DISPATCH_BATCH_SIZE", default=50)
+EMAIL_DISPATCH_MAX_ATTEMPTS = env.int("EMAIL_DISPATCH_MAX_ATTEMPTS", default=5)
+# seconds before the first retry, doubled on every further attempt
+EMAIL_DISPATCH_RETRY_DELAY = env.float("EMAIL_DISPATCH_RETRY_DELAY", default=2)
+
 
 # CORS
 # ---------------------------------------------------------------------------------
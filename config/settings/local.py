@@ -48,3 +48,7 @@ INSTALLED_APPS += ["nplusone.ext.django"]
 MIDDLEWARE += ["nplusone.ext.django.NPlusOneMiddleware"]
 NPLUSONE_LOGGER = logging.getLogger("nplusone")
 NPLUSONE_LOG_LEVEL = logging.WARN
+
+# Instrument every request with ServerTimingMiddleware
+SERVER_TIMING_SAMPLE_RATE = env.float("SERVER_TIMING_SAMPLE_RATE", default=1)
+SERVER_TIMING_HEADER = env.bool("SERVER_TIMING_HEADER", default=True)
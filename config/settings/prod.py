@@ -11,26 +11,56 @@ ALLOWED_HOSTS = env.list("DJANGO_ALLOWED_HOSTS", default=["example.com"])
 # MIDDLEWARE
 # ----------------------------------------------------------------------------
 MIDDLEWARE = [
+    # times everything below it, keep first
+    "apps.common.middleware.ServerTimingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "apps.common.middleware.ReplicaPinMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    # calls the view itself, keep after every middleware with process_view
+    "apps.common.middleware.SelectiveAtomicRequestsMiddleware",
 ]
 
 
 # DATABASES
 # ------------------------------------------------------------------------------
 DATABASES["default"] = env.db("DATABASE_URL", default="")  # noqa F405
-DATABASES["default"]["ATOMIC_REQUESTS"] = True  # noqa F405
+DATABASES["default"]["ATOMIC_REQUESTS"] = False  # noqa F405
 DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)  # noqa F405
 
+# Connection pooling with psycopg 3 (https://docs.djangoproject.com/en/dev/ref/databases/#connection-pool)
+# Each worker process keeps between DB_POOL_MIN_SIZE and DB_POOL_MAX_SIZE
+# connections, so the server needs workers * DB_POOL_MAX_SIZE of them.
+# `manage.py db_pool_status` reports how close that is to max_connections.
+if env.bool("DJANGO_DB_POOL", default=False):
+    from psycopg_pool import ConnectionPool
+
+    # Connections are returned to the pool at the end of each request instead
+    DATABASES["default"]["CONN_MAX_AGE"] = 0  # noqa F405
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {  # noqa F405
+        "min_size": env.int("DB_POOL_MIN_SIZE", default=2),
+        "max_size": env.int("DB_POOL_MAX_SIZE", default=10),
+        # seconds a request waits for a free connection before failing
+        "timeout": env.float("DB_POOL_TIMEOUT", default=10),
+        "max_idle": env.float("DB_POOL_MAX_IDLE", default=600),
+        "max_lifetime": env.float("DB_POOL_MAX_LIFETIME", default=3600),
+    }
+    if env.bool("DB_POOL_CHECK", default=True):
+        # Test connections when they leave the pool, replacing broken ones
+        pool_options = DATABASES["default"]["OPTIONS"]["pool"]  # noqa F405
+        pool_options["check"] = ConnectionPool.check_connection
+
 # CACHES
 # ------------------------------------------------------------------------------
+# Shared between workers, for the response cache and replica pins
+# https://django-environ.readthedocs.io/en/latest/types.html#environ-env-cache-url
+CACHES = {"default": env.cache("CACHE_URL", default="redis://127.0.0.1:6379/0")}
 
 
 # SECURITY
@@ -115,6 +145,8 @@ EMAIL_SUBJECT_PREFIX = env(
     "DJANGO_EMAIL_SUBJECT_PREFIX",
     default="[app]",
 )
+# Emails go through the QueuedEmail outbox, run `manage.py send_queued_emails`
+EMAIL_DISPATCH_MODE = env("EMAIL_DISPATCH_MODE", default="queue")
 
 
 # Anymail
@@ -11,6 +11,15 @@ SECRET_KEY = env(
 # https://docs.djangoproject.com/en/dev/ref/settings/#test-runner
 TEST_RUNNER = "django.test.runner.DiscoverRunner"
 
+# DATABASES
+# ------------------------------------------------------------------------------
+# Replica alias mirroring the test database, routed to only by tests that set
+# DATABASE_REPLICAS
+DATABASES["replica"] = {  # noqa F405
+    **DATABASES["default"],  # noqa F405
+    "TEST": {"MIRROR": "default"},
+}
+
 # PASSWORDS
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#password-hashers
@@ -32,6 +41,16 @@ TEMPLATES[-1]["OPTIONS"]["loaders"] = [  # type: ignore[index] # noqa F405
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-backend
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+EMAIL_DISPATCH_MODE = "sync"
+
+# LOGGING
+# ------------------------------------------------------------------------------
+# Tests that exercise ServerTimingMiddleware sample requests themselves
+SERVER_TIMING_SAMPLE_RATE = 0
+
+# USERS
+# ------------------------------------------------------------------------------
+LAST_LOGIN_BUFFERED = False
 
 # Your stuff...
 # ------------------------------------------------------------------------------